@@ -3,14 +3,43 @@ This module provides utility functions and a model for managing admin users.
 
 The module includes functions for hashing and verifying passwords using bcrypt,
 as well as a model class representing an admin user.
+
+Admin records loaded for authenticated requests are kept in a small time-limited cache,
+so the session cookie does not cost a database query on every request.
+The cache entry of an admin is dropped when their password changes.
+
+Password checks run in a bounded thread pool: at most BCRYPT_WORKERS checks run at once
+and at most BCRYPT_QUEUE wait, further login attempts are rejected right away,
+so a burst of logins can not take the CPU away from the API.
+
+The ADMIN_CACHE_TTL, BCRYPT_WORKERS and BCRYPT_QUEUE settings are read from the application
+configuration (see config.py) when the admin blueprint is registered.
 """
 
+import threading
+
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
 from flask_login import UserMixin
 
+from sqlalchemy.orm import make_transient_to_detached
+
 from models import db
 
+DEFAULT_ADMIN_CACHE_TTL = 60.0
+DEFAULT_BCRYPT_WORKERS = 2
+DEFAULT_BCRYPT_QUEUE = 16
+
+
+class PasswordCheckBusy(RuntimeError):
+    """
+    Error raised when too many password checks are already running or waiting.
+    """
+
 
 class Admin(db.Model, UserMixin):
     """
@@ -39,6 +68,7 @@ class Admin(db.Model, UserMixin):
         """
 
         self.password = hash_password(password)
+        admin_cache.invalidate(self.id)
 
     def check_password(self, password):
         """
@@ -49,9 +79,190 @@ class Admin(db.Model, UserMixin):
 
         Returns:
             bool: True if the provided password matches the hashed password, False otherwise.
+
+        Raises:
+            PasswordCheckBusy: If too many password checks are already running or waiting.
+        """
+
+        return verify_password_bounded(password, self.password)
+
+
+class AdminCache:
+    """
+    Time-limited cache of admin records keyed by ID.
+
+    The column values are cached instead of the instances, so a cached admin
+    is attached to the session of the request that uses it without a query.
+
+    Attributes:
+        ttl (float): The number of seconds a record stays cached.
+
+    Methods:
+        init_app: Read the time-to-live from the configuration of an application.
+        get: Return the cached admin with the given ID.
+        set: Cache an admin.
+        invalidate: Drop the cached admin with the given ID.
+    """
+
+    def __init__(self, ttl=DEFAULT_ADMIN_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Read the time-to-live from the configuration of an application.
+
+        Args:
+            app (Flask): The application with the ADMIN_CACHE_TTL setting.
+        """
+
+        self.ttl = app.config.get('ADMIN_CACHE_TTL', self.ttl)
+
+    def get(self, admin_id):
+        """
+        Return the cached admin with the given ID attached to the current session.
+
+        Args:
+            admin_id (int): The ID of the admin.
+
+        Returns:
+            Admin: The admin, or None if it is not cached or expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(admin_id)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at <= time.monotonic():
+                del self._entries[admin_id]
+                return None
+
+        admin = Admin(**values)
+        make_transient_to_detached(admin)
+        return db.session.merge(admin, load=False)
+
+    def set(self, admin):
+        """
+        Cache an admin.
+
+        Args:
+            admin (Admin): The admin loaded from the database.
+        """
+
+        values = {'id': admin.id, 'username': admin.username, 'password': admin.password}
+        with self._lock:
+            self._entries[admin.id] = (time.monotonic() + self.ttl, values)
+
+    def invalidate(self, admin_id):
+        """
+        Drop the cached admin with the given ID.
+
+        Args:
+            admin_id (int): The ID of the admin.
+        """
+
+        with self._lock:
+            self._entries.pop(admin_id, None)
+
+
+admin_cache = AdminCache()
+
+
+class PasswordCheckPool:
+    """
+    Bounded thread pool running the bcrypt password checks.
+
+    Attributes:
+        workers (int): The number of checks running at once.
+        queue (int): The number of checks allowed to wait for a worker.
+
+    Methods:
+        init_app: Read the pool bounds from the configuration of an application.
+        configure: Replace the pool with one of the given bounds.
+        verify: Verify a password in the pool.
+    """
+
+    def __init__(self, workers=DEFAULT_BCRYPT_WORKERS, queue=DEFAULT_BCRYPT_QUEUE):
+        self.workers = self.queue = None
+        self._executor = self._slots = None
+        self.configure(workers, queue)
+
+    def init_app(self, app):
+        """
+        Read the pool bounds from the configuration of an application.
+
+        Args:
+            app (Flask): The application with the BCRYPT_WORKERS and BCRYPT_QUEUE settings.
+        """
+
+        self.configure(app.config.get('BCRYPT_WORKERS', self.workers),
+                       app.config.get('BCRYPT_QUEUE', self.queue))
+
+    def configure(self, workers, queue):
+        """
+        Replace the pool with one of the given bounds, unless they are unchanged.
+
+        Args:
+            workers (int): The number of checks running at once.
+            queue (int): The number of checks allowed to wait for a worker.
+        """
+
+        if (workers, queue) == (self.workers, self.queue):
+            return
+        previous = self._executor
+        self.workers, self.queue = workers, queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + queue)
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+    def verify(self, password, hashed_password):
+        """
+        Verify a password in the pool.
+
+        Args:
+            password (str): The plain-text password to be checked.
+            hashed_password (str): The hashed password to be compared against.
+
+        Returns:
+            bool: True if the provided password matches the hashed password, False otherwise.
+
+        Raises:
+            PasswordCheckBusy: If too many password checks are already running or waiting.
         """
 
-        return verify_password(password, self.password)
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordCheckBusy('Too many password checks in progress')
+        try:
+            return self._executor.submit(verify_password, password, hashed_password).result()
+        finally:
+            slots.release()
+
+
+password_pool = PasswordCheckPool()
+
+
+def load_admin(admin_id):
+    """
+    Load an admin by ID, from the cache if possible.
+
+    Args:
+        admin_id (int | str): The ID of the admin.
+
+    Returns:
+        Admin: The admin, or None if there is no admin with the given ID.
+    """
+
+    admin_id = int(admin_id)
+    admin = admin_cache.get(admin_id)
+    if admin is None:
+        admin = db.session.get(Admin, admin_id)
+        if admin is not None:
+            admin_cache.set(admin)
+    return admin
 
 
 def hash_password(password):
@@ -85,3 +296,21 @@ def verify_password(password, hashed_password):
     """
 
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+def verify_password_bounded(password, hashed_password):
+    """
+    Verify a password in the bounded password check pool.
+
+    Args:
+        password (str): The plain-text password to be checked.
+        hashed_password (str): The hashed password to be compared against.
+
+    Returns:
+        bool: True if the provided password matches the hashed password, False otherwise.
+
+    Raises:
+        PasswordCheckBusy: If too many password checks are already running or waiting.
+    """
+
+    return password_pool.verify(password, hashed_password)
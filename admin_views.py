@@ -0,0 +1,177 @@
+"""
+Admin interface
+
+This blueprint holds the web pages: the home page, the admin login and logout, and the
+admin interface for adding books, authors and notes. It brings in the admin stack,
+Flask-Login, Flask-WTF and bcrypt, which read-only workers do not load, see factory.py.
+
+Routes:
+- '/' - Home page
+- '/admin' - Admin login page
+- '/admin/interface' - Admin interface for managing books, authors, and notes
+- '/logout' - Logout route
+"""
+
+import hashlib
+
+import os
+
+from flask import Blueprint, current_app, request, render_template, redirect, url_for, flash
+
+from flask_login import LoginManager, login_user, login_required, logout_user
+
+from sqlalchemy.exc import DatabaseError
+
+from models import db
+
+from writes import add_note
+
+from cache import response_cache
+
+from snapshot import rebuild_snapshot_in_background
+
+from suggest import suggest_index
+
+from versioning import current_data_version
+
+from admin import Admin, PasswordCheckBusy, admin_cache, password_pool, load_admin
+
+from forms import BookForm, AdminForm
+
+admin_ui = Blueprint('admin', __name__)
+
+login_manager = LoginManager()
+
+
+@admin_ui.record_once
+def init_admin(state):
+    """
+    Installs the login manager on the application the blueprint is registered on
+    and configures the admin cache and the password check pool from its settings.
+
+    Args:
+        state (BlueprintSetupState): The registration state.
+    """
+
+    login_manager.init_app(state.app)
+    admin_cache.init_app(state.app)
+    password_pool.init_app(state.app)
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    """
+    Loads the user for the given user ID, from the admin cache if possible.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        Admin: The user object corresponding to the given ID.
+    """
+
+    return load_admin(user_id)
+
+
+@admin_ui.route('/')
+def home():
+    """
+    Renders the home page.
+
+    Returns:
+        str: The rendered home page template.
+    """
+
+    return render_template('index.html')
+
+
+@admin_ui.route('/admin', methods=['GET', 'POST'])
+def admin_route():
+    """
+    Handles the admin login route.
+
+    Returns:
+        Response: The response to the login attempt.
+        str: The rendered admin page template.
+    """
+
+    form = AdminForm()
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        secret_word_form = request.form['secret']
+
+        secret_word = os.environ.get('SECRET_WORD')
+        if str(hashlib.sha256(secret_word_form.encode()).hexdigest()) == secret_word:
+
+            admin = Admin.query.filter_by(username=username).first()
+            try:
+                if admin and admin.check_password(password=password):
+                    login_user(admin)
+                    return redirect(url_for('admin.admin_interface'))
+            except PasswordCheckBusy:
+                flash('Too many login attempts, please try again later')
+                return redirect(url_for('admin.admin_route'))
+            flash('Invalid username or password')
+            return redirect(url_for('admin.admin_route'))
+        return redirect('https://www.youtube.com/watch?v=dQw4w9WgXcQ')
+
+    return render_template('admin_login.html', form=form)
+
+
+@admin_ui.route('/admin/interface', methods=['GET', 'POST'])
+@login_required
+def admin_interface():
+    """
+    Handles the admin interface route.
+
+    Returns:
+        Response: The response to the admin interface request.
+        str: The rendered admin interface page template.
+    """
+
+    form = BookForm()
+
+    if request.method == 'POST':
+        if form.validate_on_submit():
+            try:
+                added = add_note(author=form.author.data, biography=form.bio.data,
+                                 book=form.book.data, chapter=form.chapter.data,
+                                 content=form.content.data)
+                if not added:
+                    db.session.rollback()
+                    already_exists = True
+                    flash("This information is already in the database")
+                    return redirect(url_for('admin.admin_interface', already_exists=already_exists))
+
+                db.session.commit()
+                response_cache.clear()
+                suggest_index.refresh(current_data_version()[0])
+                if current_app.config['SNAPSHOT_ON_WRITE']:
+                    rebuild_snapshot_in_background(
+                        current_app._get_current_object())  # pylint: disable=protected-access
+                db_error = False
+                flash('Form submitted successfully')
+            except DatabaseError:
+                db.session.rollback()
+                db_error = True
+                flash('Something went wrong with the database.')
+            return redirect(url_for('admin.admin_interface', db_error=db_error))
+
+    return render_template('admin_interface.html', form=form)
+
+
+@admin_ui.route('/logout')
+@login_required
+def logout():
+    """
+    Handles the logout route.
+
+    Returns:
+        Response: The response to the logout request.
+    """
+
+    logout_user()
+    return redirect(url_for('admin.home'))
+
+
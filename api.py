@@ -0,0 +1,323 @@
+"""
+Public read API
+
+This blueprint holds the '/get/*' endpoints and the response cache counters.
+It only needs the database and the read layer, so read-only workers can serve it
+without the admin interface, see factory.py.
+
+The '/get/*' endpoints are paginated with the 'limit' and 'after' query parameters,
+the next page is linked in the 'Link' header, and 'all=true' returns every row at once.
+'/get/notes?format=ndjson' streams every note as newline-delimited JSON for full exports.
+The '/get/*' endpoints send 'ETag' and 'Last-Modified' headers, answer unchanged data
+with 304 Not Modified, and cache their responses in-process until the next catalog write.
+
+Routes:
+- '/cache/stats' - Hit, miss and eviction counters of the response cache
+- '/get/all_books' - API endpoint to retrieve all books or books by a specific author
+- '/get/author' - API endpoint to retrieve authors and their books
+- '/get/notes' - API endpoint to retrieve notes, either for a specific book or all notes
+- '/get/catalog' - API endpoint to retrieve authors with their books, chapters and notes as a tree
+- '/get/search' - API endpoint to search notes by their content
+- '/get/suggest' - API endpoint to autocomplete author names and book titles by prefix
+- '/get/changes' - API endpoint to retrieve the rows changed since a token, for delta sync
+"""
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context, url_for
+
+from replica import read_replica
+
+from queries import (find_books, find_authors, all_books, books_for_authors, all_authors,
+                     notes_for_books, all_notes, iter_notes, catalog,
+                     BOOK_FIELDS, AUTHOR_FIELDS, NOTE_FIELDS, BOOK_NOTE_FIELDS)
+
+from fieldsets import FieldsError, fields_arg
+
+from pagination import PaginationError, page_args, next_link, encode_cursor, decode_cursor
+
+from changes import changes_since
+
+from versioning import conditional, request_data_version
+
+from cache import response_cache
+
+from search import search_notes
+
+from suggest import SUGGEST_TYPES, suggest_index
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+
+api = Blueprint('api', __name__)
+
+
+def paginated(payload, next_id):
+    """
+    Builds a JSON response for a page of results.
+
+    If another page follows, its URL is sent in the 'Link' header with the 'next' relation.
+
+    Args:
+        payload (dict | list): The body of the response.
+        next_id (int): The ID the next page starts after, or None on the last page.
+
+    Returns:
+        Response: The JSON response.
+    """
+
+    response = jsonify(payload)
+    if next_id is not None:
+        response.headers['Link'] = next_link(next_id)
+    return response
+
+
+def ndjson_response(rows):
+    """
+    Builds a streamed response with one JSON document per line.
+
+    The rows are serialized one by one while the response is being sent,
+    so the whole result is never held in memory.
+
+    Args:
+        rows (iterable): The dictionaries to send.
+
+    Returns:
+        Response: The streamed 'application/x-ndjson' response.
+    """
+
+    def generate():
+        for row in rows:
+            yield current_app.json.dumps(row) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@api.errorhandler(PaginationError)
+@api.errorhandler(FieldsError)
+def handle_pagination_error(error):
+    """
+    Handles invalid pagination or fieldset parameters.
+
+    Args:
+        error (PaginationError | FieldsError): The raised error.
+
+    Returns:
+        Response: The response with the error message.
+    """
+
+    return jsonify(error=str(error)), 400
+
+
+@api.route('/cache/stats')
+def get_cache_stats():
+    """
+    Retrieves the counters of the response cache.
+
+    Returns:
+        Response: The response containing the cache counters.
+    """
+
+    return jsonify(response_cache.stats()), 200
+
+
+@api.route('/get/all_books')
+@read_replica
+@conditional
+@response_cache.cached
+def get_all_books():
+    """
+    Retrieves all books or the books of specific authors.
+
+    Several authors can be requested with repeated or comma-separated 'author' parameters,
+    their books are grouped by author name.
+
+    Returns:
+        Response: The response containing the requested books.
+    """
+
+    author_names = request.args.getlist('author')
+    after, limit = page_args()
+    fields = fields_arg(BOOK_FIELDS)
+
+    if not author_names:
+        books, next_id = all_books(after=after, limit=limit, fields=fields)
+        if books:
+            return paginated({'books': books}, next_id), 200
+        return jsonify(error='Sorry, can not find any books'), 404
+
+    authors, _ = find_authors(author_names)
+    if not authors:
+        return jsonify(error='This author does not exists'), 404
+
+    books, next_id = books_for_authors(authors, after=after, limit=limit, fields=fields)
+    if books:
+        return paginated(books, next_id), 200
+    return jsonify(error='Sorry, can not find any books'), 404
+
+
+@api.route('/get/authors')
+@read_replica
+@conditional
+@response_cache.cached
+def get_author():
+    """
+    Retrieves all authors.
+
+    Returns:
+        Response: The response containing all authors.
+    """
+
+    after, limit = page_args()
+    fields = fields_arg(AUTHOR_FIELDS)
+
+    authors, next_id = all_authors(after=after, limit=limit, fields=fields)
+    return paginated(authors, next_id), 200
+
+
+@api.route('/get/notes')
+@read_replica
+@conditional
+@response_cache.cached
+def get_notes():
+    """
+    Retrieves all notes or the notes of specific books.
+
+    Several books can be requested with repeated or comma-separated 'book' parameters,
+    their notes are grouped by book title.
+    With 'format=ndjson' the notes are streamed one per line instead of paginated.
+
+    Returns:
+        Response: The response containing the requested notes.
+    """
+
+    book_titles = request.args.getlist('book')
+    books = None
+    if book_titles:
+        books, _ = find_books(book_titles)
+        if not books:
+            return jsonify({'message': 'Book not found'}), 404
+
+    if request.args.get('format') == 'ndjson':
+        cursor = request.args.get('after')
+        after = decode_cursor(cursor) if cursor else None
+        return ndjson_response(iter_notes(books, after=after, fields=fields_arg(NOTE_FIELDS)))
+
+    after, limit = page_args()
+
+    if books:
+        notes, next_id = notes_for_books(books, after=after, limit=limit,
+                                         fields=fields_arg(BOOK_NOTE_FIELDS))
+        return paginated(notes, next_id), 200
+
+    notes, next_id = all_notes(after=after, limit=limit, fields=fields_arg(NOTE_FIELDS))
+    return paginated(notes, next_id), 200
+
+
+@api.route('/get/catalog')
+@read_replica
+@conditional
+@response_cache.cached
+def get_catalog():
+    """
+    Retrieves authors with their books, the chapters of every book and their notes.
+
+    The tree can be limited to specific authors with repeated or comma-separated
+    'author' parameters; it is paginated by author.
+
+    Returns:
+        Response: The response containing the nested catalog.
+    """
+
+    author_names = request.args.getlist('author')
+    after, limit = page_args()
+
+    authors = None
+    if author_names:
+        authors, _ = find_authors(author_names)
+        if not authors:
+            return jsonify(error='This author does not exists'), 404
+
+    tree, next_id = catalog(authors, after=after, limit=limit)
+    return paginated({'authors': tree}, next_id), 200
+
+
+@api.route('/get/search')
+@read_replica
+@conditional
+@response_cache.cached
+def get_search():
+    """
+    Searches notes by their content, best matches first.
+
+    Returns:
+        Response: The response containing the matching notes with their book and chapter.
+    """
+
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify(error='The search query is empty'), 400
+
+    offset, limit = page_args()
+    notes, next_offset = search_notes(query, offset=offset, limit=limit)
+    return paginated(notes, next_offset), 200
+
+
+@api.route('/get/suggest')
+@read_replica
+@conditional
+def get_suggest():
+    """
+    Suggests author names or book titles starting with the typed text.
+
+    The suggestions come from the in-memory index of suggest.py, so they are not
+    kept in the response cache.
+
+    Returns:
+        Response: The response containing the matching authors or books.
+    """
+
+    query = request.args.get('q', '').strip()
+    kind = request.args.get('type', 'author')
+    if not query:
+        return jsonify(error='The suggestion query is empty'), 400
+    if kind not in SUGGEST_TYPES:
+        return jsonify(error=f'Type must be one of: {", ".join(SUGGEST_TYPES)}'), 400
+
+    try:
+        limit = int(request.args.get('limit', DEFAULT_SUGGESTIONS))
+    except ValueError:
+        return jsonify(error='Limit must be an integer'), 400
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+
+    version, _ = request_data_version()
+    key = 'name' if kind == 'author' else 'title'
+    return jsonify([{'id': row_id, key: text} for row_id, text in
+                    suggest_index.lookup(kind, query, limit, version)]), 200
+
+
+@api.route('/get/changes')
+@read_replica
+@conditional
+@response_cache.cached
+def get_changes():
+    """
+    Retrieves the authors, books, chapters and notes changed after the given token.
+
+    Without a 'since' token every change is returned. The token of the last returned change
+    is sent in the body, and the 'Link' header points to the next page if more changes follow.
+
+    Returns:
+        Response: The response containing the changed rows and the token to continue from.
+    """
+
+    since = request.args.get('since')
+    after = decode_cursor(since) if since else None
+    _, limit = page_args()
+
+    changed, token, has_more = changes_since(after, limit)
+    response = jsonify(changes=changed,
+                       token=encode_cursor(token) if token is not None else None)
+    if has_more:
+        args = request.args.to_dict(flat=False)
+        args['since'] = encode_cursor(token)
+        response.headers['Link'] = f'<{url_for(request.endpoint, **args)}>; rel="next"'
+    return response, 200
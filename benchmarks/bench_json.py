@@ -0,0 +1,94 @@
+"""
+JSON serialization benchmark
+
+This script compares the time needed to build a 'jsonify' response for a synthetic
+list of notes with the standard library encoder and with orjson, both through the
+FastJSONProvider of json_provider.py, and checks that both produce the same bytes.
+
+Usage:
+    python benchmarks/bench_json.py [--notes N] [--repeat N]
+"""
+
+import argparse
+
+import os
+
+import sys
+
+import time
+
+from flask import Flask
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_provider import FastJSONProvider, orjson  # pylint: disable=wrong-import-position
+
+
+def make_notes(count):
+    """
+    Builds a payload shaped like the '/get/notes' response.
+
+    Args:
+        count (int): The number of notes.
+
+    Returns:
+        list: The notes as dictionaries with Cyrillic and Latin text.
+    """
+
+    return [{'id': i, 'book': f'Листи до Луцилія {i % 50}', 'chapter': f'Лист {i % 124}',
+             'content': f'Note {i}: ' + 'Поки ми відкладаємо життя, воно минає. ' * 6}
+            for i in range(1, count + 1)]
+
+
+def time_response(provider, payload, repeat):
+    """
+    Times building a JSON response.
+
+    Args:
+        provider (FastJSONProvider): The provider to use.
+        payload (object): The data to serialize.
+        repeat (int): The number of responses to build.
+
+    Returns:
+        tuple: The average time in milliseconds and the response body.
+    """
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = provider.response(payload).get_data()
+    return (time.perf_counter() - start) / repeat * 1000, body
+
+
+def main():
+    """
+    Prints the serialization time of both encoders.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--notes', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    if orjson is None:
+        sys.exit('orjson is not installed')
+
+    app = Flask(__name__)
+    payload = make_notes(args.notes)
+
+    stdlib = FastJSONProvider(app)
+    stdlib.use_orjson = False
+    fast = FastJSONProvider(app)
+
+    with app.app_context():
+        stdlib_ms, stdlib_body = time_response(stdlib, payload, args.repeat)
+        fast_ms, fast_body = time_response(fast, payload, args.repeat)
+
+    print(f'{args.notes} notes, {len(fast_body) / 1e6:.1f} MB, '
+          f'identical output: {stdlib_body == fast_body}')
+    print(f'{"encoder":<10}{"ms":>10}')
+    print(f'{"stdlib":<10}{stdlib_ms:>10.1f}')
+    print(f'{"orjson":<10}{fast_ms:>10.1f}  ({stdlib_ms / fast_ms:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
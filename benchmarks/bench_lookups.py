@@ -0,0 +1,158 @@
+"""
+Lookup latency benchmark
+
+This script measures the latency of the lookups made by the API and the admin interface
+on a seeded database, first without and then with the lookup indexes from models.py.
+
+Usage:
+    python benchmarks/bench_lookups.py [--authors N] [--books-per-author N]
+        [--notes-per-book N] [--repeat N] [--database-uri URI]
+
+By default the database is a temporary SQLite file.
+"""
+
+import argparse
+
+import os
+
+import sys
+
+import tempfile
+
+import time
+
+from datetime import date
+
+from flask import Flask
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import db, Author, Book, Chapter, Note  # pylint: disable=wrong-import-position
+
+LOOKUP_TABLES = ('author', 'book', 'chapter', 'note')
+
+
+def seed(authors, books_per_author, notes_per_book):
+    """
+    Fills the database with generated authors, books, chapters and notes.
+
+    Args:
+        authors (int): The number of authors.
+        books_per_author (int): The number of books of every author.
+        notes_per_book (int): The number of chapters and notes of every book.
+    """
+
+    today = date.today()
+    author_rows = [{'id': a, 'name': f'Author {a}', 'biography': 'Biography'}
+                   for a in range(1, authors + 1)]
+    db.session.execute(db.insert(Author), author_rows)
+
+    book_rows, chapter_rows, note_rows = [], [], []
+    for a in range(1, authors + 1):
+        for b in range(books_per_author):
+            book_id = len(book_rows) + 1
+            book_rows.append({'id': book_id, 'title': f'Book {book_id}', 'author_id': a})
+            for n in range(notes_per_book):
+                chapter_id = len(chapter_rows) + 1
+                chapter_rows.append({'id': chapter_id, 'book_id': book_id,
+                                     'chapter_name': f'Chapter {n}'})
+                note_rows.append({'book_id': book_id, 'chapter_id': chapter_id,
+                                  'content': f'Note {chapter_id}', 'created_date': today})
+
+    db.session.execute(db.insert(Book), book_rows)
+    db.session.execute(db.insert(Chapter), chapter_rows)
+    db.session.execute(db.insert(Note), note_rows)
+    db.session.commit()
+
+
+def lookup_indexes():
+    """
+    Collects the indexes the models define on the lookup tables.
+
+    Returns:
+        list: The SQLAlchemy Index objects.
+    """
+
+    return [index for name in LOOKUP_TABLES for index in db.metadata.tables[name].indexes]
+
+
+def run_lookups(authors, books, repeat):
+    """
+    Times the hot lookups of the API and the admin interface.
+
+    Args:
+        authors (int): The number of seeded authors.
+        books (int): The number of seeded books.
+        repeat (int): The number of times every lookup is made.
+
+    Returns:
+        dict: The average latency of every lookup in milliseconds.
+    """
+
+    lookups = {
+        'author by name': lambda i: Author.query.filter_by(
+            name=f'Author {i % authors + 1}').first(),
+        'book by title': lambda i: Book.query.filter_by(title=f'Book {i % books + 1}').first(),
+        'books by author': lambda i: Book.query.filter_by(author_id=i % authors + 1).all(),
+        'notes by book': lambda i: Note.query.filter_by(book_id=i % books + 1).all(),
+        'chapter by book and name': lambda i: Chapter.query.filter_by(
+            book_id=i % books + 1, chapter_name='Chapter 0').first(),
+    }
+
+    results = {}
+    for name, lookup in lookups.items():
+        start = time.perf_counter()
+        for i in range(repeat):
+            lookup(i)
+            db.session.expunge_all()
+        results[name] = (time.perf_counter() - start) / repeat * 1000
+    return results
+
+
+def main():
+    """
+    Seeds the database and prints the lookup latency without and with the indexes.
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--authors', type=int, default=500)
+    parser.add_argument('--books-per-author', type=int, default=10)
+    parser.add_argument('--notes-per-book', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--database-uri')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = (
+            args.database_uri or f'sqlite:///{os.path.join(directory, "bench.db")}')
+        db.init_app(app)
+
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            seed(args.authors, args.books_per_author, args.notes_per_book)
+            books = args.authors * args.books_per_author
+
+            with db.engine.begin() as connection:
+                for index in lookup_indexes():
+                    index.drop(connection)
+            before = run_lookups(args.authors, books, args.repeat)
+
+            with db.engine.begin() as connection:
+                for index in lookup_indexes():
+                    index.create(connection)
+            after = run_lookups(args.authors, books, args.repeat)
+
+            print(f'{books * args.notes_per_book} notes, {books} books, {args.authors} authors')
+            print(f'{"lookup":<26}{"before, ms":>12}{"after, ms":>12}{"speedup":>10}')
+            for name, latency in before.items():
+                print(f'{name:<26}{latency:>12.3f}{after[name]:>12.3f}'
+                      f'{latency / after[name]:>9.1f}x')
+
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
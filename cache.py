@@ -0,0 +1,184 @@
+"""
+In-process response cache for the read endpoints
+
+Writes to the catalog only come through the admin interface, so the responses of the
+'/get/*' endpoints can be reused until the next write.
+
+The cache is a bounded LRU with a time-to-live, keyed by route and query arguments.
+Every entry remembers the data version it was built for: an entry built for an older
+version is never served, so a write made by any worker invalidates the entries of all
+workers, and the worker that made the write also clears its own cache right away.
+
+Every entry also keeps the compressed bodies of its response, filled in by compression.py,
+so a cached payload is never compressed twice for the same encoding.
+
+Classes:
+- ResponseCache - The bounded LRU+TTL cache with hit, miss and eviction counters
+
+Variables:
+- response_cache - The cache of the read endpoints, configured by ResponseCache.init_app
+"""
+
+import threading
+
+import time
+
+from collections import OrderedDict
+
+from functools import wraps
+
+from flask import Response, request, make_response
+
+from versioning import request_data_version
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of responses with a time-to-live.
+
+    Attributes:
+        max_entries (int): The maximum number of cached responses.
+        ttl (float): The number of seconds a response stays valid.
+
+    Methods:
+        init_app: Read the size and time-to-live from the configuration of an application.
+        get: Return the cached entry for a key and data version.
+        set: Store an entry for a key and data version.
+        clear: Drop every entry.
+        stats: Return the hit, miss and eviction counters.
+        cached: Decorator caching the responses of a view.
+    """
+
+    def __init__(self, max_entries=512, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def init_app(self, app):
+        """
+        Read the size and time-to-live from the configuration of an application.
+
+        Args:
+            app (Flask): The application with the RESPONSE_CACHE_SIZE and
+                RESPONSE_CACHE_TTL settings.
+        """
+
+        self.max_entries = app.config.get('RESPONSE_CACHE_SIZE', self.max_entries)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', self.ttl)
+
+    def get(self, key, version):
+        """
+        Return the cached entry for a key if it was built for the given data version.
+
+        Args:
+            key (tuple): The cache key.
+            version (int): The current data version.
+
+        Returns:
+            object: The cached entry, or None on a miss.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            entry_version, expires_at, value = entry
+            if entry_version != version or expires_at <= time.monotonic():
+                del self._entries[key]
+                if entry_version != version:
+                    self._invalidations += 1
+                else:
+                    self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key, version, value):
+        """
+        Store an entry for a key, evicting the least recently used entries if full.
+
+        Args:
+            key (tuple): The cache key.
+            version (int): The data version the entry was built for.
+            value (object): The entry to store.
+        """
+
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Drop every entry.
+        """
+
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return the counters of the cache.
+
+        Returns:
+            dict: The hit, miss, eviction, expiration and invalidation counters
+            together with the current and maximum number of entries.
+        """
+
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses,
+                    'evictions': self._evictions, 'expirations': self._expirations,
+                    'invalidations': self._invalidations,
+                    'size': len(self._entries), 'max_entries': self.max_entries}
+
+    def cached(self, view):
+        """
+        Decorator caching the successful responses of a view.
+
+        Streamed responses are never cached. The responses carry the dictionary of
+        compressed bodies of their entry as their 'encoded_bodies' attribute.
+
+        Args:
+            view (callable): The view function to wrap.
+
+        Returns:
+            callable: The wrapped view function.
+        """
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            version, _ = request_data_version()
+
+            entry = self.get(key, version)
+            if entry is not None:
+                body, status, headers, encoded_bodies = entry
+                response = Response(body, status=status, headers=headers)
+                response.encoded_bodies = encoded_bodies
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                response.encoded_bodies = {}
+                self.set(key, version, (response.get_data(), response.status_code,
+                                        list(response.headers), response.encoded_bodies))
+            return response
+
+        return wrapper
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,134 @@
+"""
+Negotiated compression of JSON responses
+
+Notes and biographies are long texts, so the JSON responses of the read endpoints
+compress well. Every JSON response of at least COMPRESS_MIN_SIZE bytes is compressed
+with the best encoding the client accepts: brotli, zstd or gzip.
+Brotli and zstd are only offered when the optional 'brotli' and 'zstandard' packages
+are installed.
+
+Responses served from the response cache carry the compressed bodies of their cache entry,
+so a cached payload is compressed at most once per encoding and data version.
+
+Compressed responses get a weak entity tag, since their bytes differ from the
+uncompressed representation while their content is the same.
+
+Functions:
+- negotiate_encoding - Picks the encoding for the current request
+- compress - Compresses a body with an encoding
+- init_compression - Installs the compression on a Flask application
+"""
+
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+DEFAULT_MIN_SIZE = 1024
+
+COMPRESSIBLE_MIMETYPES = ('application/json',)
+
+COMPRESSORS = {'gzip': lambda data: gzip.compress(data, compresslevel=6)}
+if zstandard is not None:
+    COMPRESSORS['zstd'] = lambda data: zstandard.ZstdCompressor(level=3).compress(data)
+if brotli is not None:
+    COMPRESSORS['br'] = lambda data: brotli.compress(data, quality=5)
+
+# Preferred encodings first, used when the client accepts several equally
+PREFERENCE = ('br', 'zstd', 'gzip')
+
+
+def negotiate_encoding():
+    """
+    Picks the encoding for the current request from its 'Accept-Encoding' header.
+
+    Returns:
+        str: The accepted encoding with the highest quality, or None to send the body as is.
+    """
+
+    accepted = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in PREFERENCE:
+        if encoding not in COMPRESSORS:
+            continue
+        quality = accepted[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding):
+    """
+    Compresses a body with an encoding.
+
+    Args:
+        data (bytes): The body.
+        encoding (str): The encoding, one of COMPRESSORS.
+
+    Returns:
+        bytes: The compressed body.
+    """
+
+    return COMPRESSORS[encoding](data)
+
+
+def _compress_response(response):
+    """
+    Compresses a JSON response if it is large enough and the client accepts an encoding.
+
+    Args:
+        response (Response): The response of the request.
+
+    Returns:
+        Response: The response, compressed if possible.
+    """
+
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    data = response.get_data()
+    if len(data) < current_app.config.get('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    # Bodies compressed earlier for the same cache entry, see cache.py
+    encoded_bodies = getattr(response, 'encoded_bodies', None)
+    if encoded_bodies is not None and encoding in encoded_bodies:
+        compressed = encoded_bodies[encoding]
+    else:
+        compressed = compress(data, encoding)
+        if encoded_bodies is not None:
+            encoded_bodies[encoding] = compressed
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app):
+    """
+    Compresses the JSON responses of an application.
+
+    Args:
+        app (Flask): The application.
+    """
+
+    app.after_request(_compress_response)
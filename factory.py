@@ -0,0 +1,101 @@
+"""
+Application factory
+
+create_app() builds the Flask application from the environment (see config.py) and the
+given overrides, and registers its parts:
+- the public read API blueprint (api.py), always
+- the admin interface blueprint (admin_views.py), Flask-Migrate and the management commands,
+  unless API_ONLY is set
+
+The admin stack (Flask-Login, Flask-WTF, WTForms, bcrypt) and Alembic are imported only
+when they are registered, so read-only workers started with API_ONLY start faster and use
+less memory:
+
+    API_ONLY=true gunicorn -c gunicorn.conf.py 'factory:create_app()'
+
+Functions:
+- create_app - Builds and configures the Flask application
+"""
+
+from dotenv import load_dotenv
+
+from flask import Flask
+
+from config import app_config
+
+from models import db
+
+from cache import response_cache
+
+from json_provider import FastJSONProvider
+
+from instrumentation import init_sql_timing
+
+from metrics import init_metrics
+
+from compression import init_compression
+
+from snapshot import init_snapshot
+
+from api import api
+
+
+def _init_admin(app):
+    """
+    Registers the admin interface, the migrations and the management commands.
+
+    The modules are imported here, so an API-only application never loads them.
+
+    Args:
+        app (Flask): The application.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from flask_migrate import Migrate
+
+    from search import include_object
+    from importer import import_notes_command
+    from read_model import rebuild_read_model_command
+    from snapshot import build_snapshot_command
+    from admin_views import admin_ui
+
+    Migrate(app, db, include_object=include_object)
+
+    app.cli.add_command(import_notes_command)
+    app.cli.add_command(rebuild_read_model_command)
+    app.cli.add_command(build_snapshot_command)
+
+    app.register_blueprint(admin_ui)
+
+
+def create_app(config=None):
+    """
+    Builds the Flask application.
+
+    Args:
+        config (dict): Configuration overriding the values read from the environment,
+            for example {'API_ONLY': True} or a test database URI.
+
+    Returns:
+        Flask: The configured application.
+    """
+
+    load_dotenv()
+
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config.update(app_config())
+    app.config.update(config or {})
+
+    init_sql_timing(app)
+    init_metrics(app)
+    init_compression(app)
+    init_snapshot(app)
+    response_cache.init_app(app)
+
+    app.register_blueprint(api)
+    if not app.config['API_ONLY']:
+        _init_admin(app)
+
+    db.init_app(app)
+    return app
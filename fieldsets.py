@@ -0,0 +1,46 @@
+"""
+Sparse fieldsets for the API endpoints
+
+The '/get/*' endpoints return every field of their rows by default. A client that only needs
+some of them, for example the IDs and names of the authors for a picker, lists them in the
+'fields' query parameter, separated by commas: '/get/authors?fields=id,name'.
+
+The ID is always returned, as it is needed to continue to the next page.
+
+Functions:
+- fields_arg - Reads the requested fields of the current request
+"""
+
+from flask import request
+
+
+class FieldsError(ValueError):
+    """
+    Error raised when the 'fields' parameter names a field the endpoint does not have.
+    """
+
+
+def fields_arg(available):
+    """
+    Reads the fields requested in the 'fields' query parameter of the current request.
+
+    Args:
+        available (iterable): The names of the fields the endpoint can return.
+
+    Returns:
+        list: The requested field names in request order, or None for every field.
+
+    Raises:
+        FieldsError: If an unknown field is requested.
+    """
+
+    value = request.args.get('fields')
+    if not value:
+        return None
+
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in available]
+    if unknown:
+        raise FieldsError(f'Unknown fields: {", ".join(unknown)}; '
+                          f'available fields: {", ".join(available)}')
+    return fields or None
@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration
+
+Removes the Prometheus values of exited workers when PROMETHEUS_MULTIPROC_DIR is set,
+see metrics.py.
+"""
+
+from metrics import mark_worker_dead
+
+
+def child_exit(server, worker):  # pylint: disable=unused-argument
+    """
+    Called by gunicorn in the master process after a worker exited.
+    """
+
+    mark_worker_dead(worker.pid)
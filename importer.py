@@ -0,0 +1,324 @@
+"""
+Bulk import of authors, books, chapters and notes
+
+This module provides the 'flask import-notes' command, which loads notes from
+JSON Lines or CSV files instead of submitting them one by one in the admin interface.
+
+Every record holds the fields of the admin form:
+author, bio (optional), book, chapter, content and optionally created_date (YYYY-MM-DD).
+
+The records are loaded in batches, each batch in a single transaction.
+Existing authors, books and chapters are read once into in-memory maps,
+so no record needs its own lookup, and new rows are written with multi-row INSERTs.
+As in the admin interface, authors are matched by name, books by title, chapters by name
+within their book, and a note whose content digest already exists in its chapter is
+skipped by the unique index, which makes repeated imports of the same file harmless.
+The read model rows of the new notes are written and the new rows are logged
+for the change feed in the same transaction.
+
+Functions:
+- read_records - Reads records from a .jsonl or .csv file
+- import_records - Loads records into the database in batches
+- import_notes_command - The 'flask import-notes' command
+"""
+
+import csv
+
+import json
+
+import time
+
+from datetime import date
+
+from itertools import islice
+
+import click
+
+from flask.cli import with_appcontext
+
+from sqlalchemy.exc import DatabaseError
+
+from models import db, Author, Book, Chapter, Note, content_hash
+
+from writes import DIALECT_INSERTS
+
+from read_model import add_note_summaries
+
+from changes import record_changes
+
+DEFAULT_BATCH_SIZE = 5000
+
+REQUIRED_FIELDS = ('author', 'book', 'chapter', 'content')
+
+
+class RecordError(ValueError):
+    """
+    Error raised when a record to import is missing a required field or is malformed.
+    """
+
+
+class ImportStats:
+    """
+    Counters of a bulk import.
+
+    Attributes:
+        records (int): The number of processed records.
+        authors (int): The number of created authors.
+        books (int): The number of created books.
+        chapters (int): The number of created chapters.
+        notes (int): The number of created notes.
+        skipped (int): The number of records skipped as duplicates.
+        seconds (float): The duration of the import.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.authors = 0
+        self.books = 0
+        self.chapters = 0
+        self.notes = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        """
+        float: The number of processed records per second.
+        """
+
+        return self.records / self.seconds if self.seconds else 0.0
+
+
+def read_records(path):
+    """
+    Reads records from a JSON Lines (.jsonl, .ndjson) or CSV (.csv) file.
+
+    Args:
+        path (str): The path of the file.
+
+    Yields:
+        dict: The records in file order.
+
+    Raises:
+        RecordError: If the file type is not supported or a line is not valid JSON.
+    """
+
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as file:
+            yield from csv.DictReader(file)
+    elif path.endswith(('.jsonl', '.ndjson')):
+        with open(path, encoding='utf-8') as file:
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as error:
+                    raise RecordError(f'{path}:{number}: {error}') from error
+    else:
+        raise RecordError(f'{path}: expected a .jsonl, .ndjson or .csv file')
+
+
+def _batched(records, size):
+    """
+    Splits an iterable of records into lists of the given size.
+
+    Args:
+        records (iterable): The records.
+        size (int): The batch size.
+
+    Yields:
+        list: The batches.
+    """
+
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _validate(record):
+    """
+    Checks that a record has every required field.
+
+    Args:
+        record (dict): The record.
+
+    Returns:
+        dict: The record with stripped values and a parsed creation date.
+
+    Raises:
+        RecordError: If a required field is missing or empty, or the date is invalid.
+    """
+
+    record = {key: value.strip() if isinstance(value, str) else value
+              for key, value in record.items()}
+    missing = [field for field in REQUIRED_FIELDS if not record.get(field)]
+    if missing:
+        raise RecordError(f'Record is missing {", ".join(missing)}: {record}')
+
+    try:
+        record['created_date'] = (date.fromisoformat(record['created_date'])
+                                  if record.get('created_date') else date.today())
+    except (TypeError, ValueError) as error:
+        raise RecordError(f'Record has an invalid created_date: {record}') from error
+    return record
+
+
+def _insert(model, rows, *columns):
+    """
+    Inserts rows with a multi-row INSERT and returns the given columns of the new rows.
+
+    Args:
+        model (db.Model): The model to insert into.
+        rows (list): The rows as dictionaries.
+        *columns: The columns to return.
+
+    Returns:
+        list: The returned rows.
+    """
+
+    if not rows:
+        return []
+    return db.session.execute(db.insert(model).returning(model.id, *columns), rows).all()
+
+
+def _import_batch(batch, maps, stats):
+    """
+    Loads a single batch of records.
+
+    Args:
+        batch (list): The validated records.
+        maps (dict): The author, book and chapter maps, updated with the new rows.
+        stats (ImportStats): The counters, updated with the batch.
+
+    Returns:
+        dict: The IDs of the new rows by entity, for the change feed.
+    """
+
+    authors, books, chapters = maps['authors'], maps['books'], maps['chapters']
+
+    new_authors = {}
+    for record in batch:
+        if record['author'] not in authors:
+            new_authors.setdefault(record['author'], record.get('bio') or '')
+    changes = {'author': [], 'book': [], 'chapter': []}
+    for author_id, name in _insert(Author, [{'name': name, 'biography': bio}
+                                            for name, bio in new_authors.items()],
+                                   Author.name):
+        authors[name] = author_id
+        changes['author'].append(author_id)
+
+    new_books = {}
+    for record in batch:
+        if record['book'] not in books:
+            new_books.setdefault(record['book'], authors[record['author']])
+    for book_id, title in _insert(Book, [{'title': title, 'author_id': author_id}
+                                         for title, author_id in new_books.items()],
+                                  Book.title):
+        books[title] = book_id
+        changes['book'].append(book_id)
+
+    new_chapters = {}
+    for record in batch:
+        key = (books[record['book']], record['chapter'])
+        if key not in chapters:
+            new_chapters.setdefault(key, {'book_id': key[0], 'chapter_name': key[1]})
+    for chapter_id, book_id, name in _insert(Chapter, list(new_chapters.values()),
+                                             Chapter.book_id, Chapter.chapter_name):
+        chapters[(book_id, name)] = chapter_id
+        changes['chapter'].append(chapter_id)
+
+    notes = [{'book_id': books[record['book']],
+              'chapter_id': chapters[(books[record['book']], record['chapter'])],
+              'content': record['content'], 'content_hash': content_hash(record['content']),
+              'created_date': record['created_date']} for record in batch]
+    insert = DIALECT_INSERTS[db.session.get_bind(mapper=Note).dialect.name]
+    note_ids = db.session.execute(
+        insert(Note).on_conflict_do_nothing(
+            index_elements=['book_id', 'chapter_id', 'content_hash']).returning(Note.id),
+        notes
+    ).scalars().all()
+    add_note_summaries(note_ids)
+    added = len(note_ids)
+
+    stats.records += len(batch)
+    stats.authors += len(new_authors)
+    stats.books += len(new_books)
+    stats.chapters += len(new_chapters)
+    stats.notes += added
+    stats.skipped += len(batch) - added
+
+    changes['note'] = note_ids
+    return changes
+
+
+def import_records(records, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Loads records into the database in batches, one transaction per batch.
+
+    Args:
+        records (iterable): The records to load.
+        batch_size (int): The number of records per transaction.
+        progress (callable): Called with the counters after every committed batch.
+
+    Returns:
+        ImportStats: The counters of the import.
+
+    Raises:
+        RecordError: If a record is invalid; the batch it belongs to is rolled back.
+        DatabaseError: If a batch can not be written; the batch is rolled back.
+    """
+
+    stats = ImportStats()
+    start = time.perf_counter()
+
+    maps = {
+        'authors': dict(db.session.execute(db.select(Author.name, Author.id)).all()),
+        'books': dict(db.session.execute(db.select(Book.title, Book.id)).all()),
+        'chapters': {(book_id, name): chapter_id for chapter_id, book_id, name in
+                     db.session.execute(db.select(Chapter.id, Chapter.book_id,
+                                                  Chapter.chapter_name))},
+    }
+
+    for batch in _batched(records, batch_size):
+        try:
+            changes = _import_batch([_validate(record) for record in batch], maps, stats)
+            record_changes(changes)
+            db.session.commit()
+        except (RecordError, DatabaseError):
+            db.session.rollback()
+            raise
+
+        stats.seconds = time.perf_counter() - start
+        if progress:
+            progress(stats)
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+@click.command('import-notes')
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True,
+              type=click.IntRange(min=1), help='Number of records per transaction.')
+@with_appcontext
+def import_notes_command(paths, batch_size):
+    """
+    Import authors, books, chapters and notes from .jsonl or .csv files.
+    """
+
+    def report(stats):
+        click.echo(f'{stats.records} records, {stats.rows_per_second:.0f} rows/s')
+
+    def records():
+        for path in paths:
+            yield from read_records(path)
+
+    try:
+        stats = import_records(records(), batch_size=batch_size, progress=report)
+    except RecordError as error:
+        raise click.ClickException(str(error)) from error
+
+    click.echo(f'Imported {stats.notes} notes, {stats.chapters} chapters, {stats.books} books '
+               f'and {stats.authors} authors, skipped {stats.skipped} duplicates '
+               f'in {stats.seconds:.2f}s ({stats.rows_per_second:.0f} rows/s)')
@@ -0,0 +1,131 @@
+"""
+Per-request SQL query counting and timing
+
+When the SQL_TIMING setting is enabled, every SQL statement executed while handling a request
+is counted and timed through SQLAlchemy engine events. The totals are sent in the
+'Server-Timing' response header and written as a structured JSON log line.
+
+When the setting is disabled no event listener is installed, so it costs nothing.
+
+Functions:
+- init_sql_timing - Installs the instrumentation on a Flask application
+"""
+
+import json
+
+import logging
+
+import time
+
+from flask import g, has_app_context, request
+
+from sqlalchemy import event
+
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+START_TIME_ATTRIBUTE = '_sql_timing_start'
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    """
+    Remembers when a statement started, on its execution context.
+
+    The context belongs to a single statement, so a statement that fails and never
+    reaches after_cursor_execute leaves nothing behind for the next one.
+    """
+
+    if context is not None:
+        setattr(context, START_TIME_ATTRIBUTE, time.perf_counter())
+
+
+def _add_statement(context):
+    """
+    Adds a finished or failed statement to the totals of the current request.
+
+    Args:
+        context (ExecutionContext): The execution context of the statement.
+    """
+
+    started = getattr(context, START_TIME_ATTRIBUTE, None)
+    if started is None:
+        return
+    delattr(context, START_TIME_ATTRIBUTE)
+    if has_app_context() and 'sql_queries' in g:
+        g.sql_queries += 1
+        g.sql_seconds += time.perf_counter() - started
+
+
+def _after_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    """
+    Adds a finished statement to the totals of the current request.
+    """
+
+    _add_statement(context)
+
+
+def _handle_error(exception_context):
+    """
+    Adds a failed statement to the totals of the current request.
+    """
+
+    _add_statement(exception_context.execution_context)
+
+
+def _start_request():
+    """
+    Resets the totals at the start of a request.
+    """
+
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+    g.request_started = time.perf_counter()
+
+
+def _finish_request(response):
+    """
+    Sends the totals of the request in the 'Server-Timing' header and the log.
+
+    Args:
+        response (Response): The response of the request.
+
+    Returns:
+        Response: The response with the 'Server-Timing' header.
+    """
+
+    if 'sql_queries' not in g:
+        return response
+
+    db_ms = g.sql_seconds * 1000
+    total_ms = (time.perf_counter() - g.request_started) * 1000
+
+    response.headers.add('Server-Timing',
+                         f'db;desc="{g.sql_queries} queries";dur={db_ms:.3f}')
+    response.headers.add('Server-Timing', f'total;dur={total_ms:.3f}')
+
+    logger.info(json.dumps({'method': request.method, 'path': request.full_path.rstrip('?'),
+                            'status': response.status_code, 'queries': g.sql_queries,
+                            'db_ms': round(db_ms, 3), 'total_ms': round(total_ms, 3)},
+                           ensure_ascii=False))
+    return response
+
+
+def init_sql_timing(app):
+    """
+    Installs the SQL query counting and timing on an application if SQL_TIMING is enabled.
+
+    Args:
+        app (Flask): The application.
+    """
+
+    if not app.config.get('SQL_TIMING'):
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
@@ -0,0 +1,132 @@
+"""
+Prometheus metrics
+
+This module records the latency, response size, status code and number of in-flight requests
+of every endpoint and exposes them in the Prometheus text format on '/metrics'.
+
+With several gunicorn workers, set the PROMETHEUS_MULTIPROC_DIR environment variable to an
+empty directory shared by the workers before they start: every worker then writes its values
+to memory-mapped files there and '/metrics' aggregates the files of all workers.
+The gunicorn.conf.py file removes the files of exited workers.
+
+Functions:
+- init_metrics - Registers the request hooks and the '/metrics' endpoint on an application
+- mark_worker_dead - Removes the live values of an exited worker process
+"""
+
+import os
+
+import time
+
+from flask import Response, g, request
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter,
+                               Gauge, Histogram, generate_latest, multiprocess)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'Request latency in seconds.',
+                            ['method', 'endpoint'], buckets=LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram('http_response_size_bytes', 'Response body size in bytes.',
+                          ['method', 'endpoint'], buckets=SIZE_BUCKETS)
+REQUESTS = Counter('http_requests', 'Handled requests by status code.',
+                   ['method', 'endpoint', 'status'])
+IN_FLIGHT = Gauge('http_requests_in_flight', 'Requests currently being handled.',
+                  ['endpoint'], multiprocess_mode='livesum')
+
+
+def _endpoint():
+    """
+    Returns the label of the endpoint handling the current request.
+
+    Returns:
+        str: The endpoint name, or 'unmatched' if no route matched.
+    """
+
+    return request.endpoint or 'unmatched'
+
+
+def _start_request():
+    """
+    Counts the request as in flight and remembers when it started.
+    """
+
+    if request.endpoint == 'metrics':
+        return
+    g.metrics_started = time.perf_counter()
+    IN_FLIGHT.labels(_endpoint()).inc()
+
+
+def _finish_request(response):
+    """
+    Records the latency, size and status code of the request.
+
+    Args:
+        response (Response): The response of the request.
+
+    Returns:
+        Response: The unchanged response.
+    """
+
+    if 'metrics_started' not in g:
+        return response
+
+    endpoint = _endpoint()
+    REQUEST_LATENCY.labels(request.method, endpoint).observe(
+        time.perf_counter() - g.metrics_started)
+    if response.content_length is not None:
+        RESPONSE_SIZE.labels(request.method, endpoint).observe(response.content_length)
+    REQUESTS.labels(request.method, endpoint, str(response.status_code)).inc()
+    return response
+
+
+def _teardown_request(_):
+    """
+    Stops counting the request as in flight, also when it failed.
+    """
+
+    if g.pop('metrics_started', None) is not None:
+        IN_FLIGHT.labels(_endpoint()).dec()
+
+
+def _metrics():
+    """
+    Renders the metrics of every worker in the Prometheus text format.
+
+    Returns:
+        Response: The metrics.
+    """
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app):
+    """
+    Registers the request hooks and the '/metrics' endpoint on an application.
+
+    Args:
+        app (Flask): The application.
+    """
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', _metrics)
+
+
+def mark_worker_dead(pid):
+    """
+    Removes the live values, such as in-flight requests, of an exited worker process.
+
+    Args:
+        pid (int): The process ID of the worker.
+    """
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
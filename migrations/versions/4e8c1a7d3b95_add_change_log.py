@@ -0,0 +1,38 @@
+"""add change log
+
+Revision ID: 4e8c1a7d3b95
+Revises: 7b3d5f9a1e62
+Create Date: 2026-10-17 14:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8c1a7d3b95'
+down_revision = '7b3d5f9a1e62'
+branch_labels = None
+depends_on = None
+
+# Parents first, so a mirror replaying the backfilled log never sees a dangling reference
+BACKFILL_TABLES = ('author', 'book', 'chapter', 'note')
+
+
+def upgrade():
+    op.create_table('change_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    for table in BACKFILL_TABLES:
+        op.execute(
+            f"INSERT INTO change_log (entity, entity_id, changed_at) "
+            f"SELECT '{table}', id, CURRENT_TIMESTAMP FROM {table} ORDER BY id"
+        )
+
+
+def downgrade():
+    op.drop_table('change_log')
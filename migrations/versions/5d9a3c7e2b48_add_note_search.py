@@ -0,0 +1,47 @@
+"""add note search
+
+Revision ID: 5d9a3c7e2b48
+Revises: c7b2e91f4a36
+Create Date: 2026-10-17 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d9a3c7e2b48'
+down_revision = 'c7b2e91f4a36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE note ADD COLUMN search_vector tsvector "
+                   "GENERATED ALWAYS AS (to_tsvector('simple', content)) STORED")
+        op.execute("CREATE INDEX ix_note_search_vector ON note USING GIN (search_vector)")
+    elif op.get_bind().dialect.name == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE note_fts USING fts5(content, content='note', "
+                   "content_rowid='id', tokenize='unicode61 remove_diacritics 2')")
+        op.execute("CREATE TRIGGER note_fts_insert AFTER INSERT ON note BEGIN "
+                   "INSERT INTO note_fts(rowid, content) VALUES (new.id, new.content); END")
+        op.execute("CREATE TRIGGER note_fts_delete AFTER DELETE ON note BEGIN "
+                   "INSERT INTO note_fts(note_fts, rowid, content) "
+                   "VALUES ('delete', old.id, old.content); END")
+        op.execute("CREATE TRIGGER note_fts_update AFTER UPDATE OF content ON note BEGIN "
+                   "INSERT INTO note_fts(note_fts, rowid, content) "
+                   "VALUES ('delete', old.id, old.content); "
+                   "INSERT INTO note_fts(rowid, content) VALUES (new.id, new.content); END")
+        op.execute("INSERT INTO note_fts(note_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX ix_note_search_vector")
+        op.execute("ALTER TABLE note DROP COLUMN search_vector")
+    elif op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER note_fts_update")
+        op.execute("DROP TRIGGER note_fts_delete")
+        op.execute("DROP TRIGGER note_fts_insert")
+        op.execute("DROP TABLE note_fts")
@@ -0,0 +1,51 @@
+"""add note summary
+
+Revision ID: 7b3d5f9a1e62
+Revises: e2f84b1d9c03
+Create Date: 2026-10-17 10:25:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3d5f9a1e62'
+down_revision = 'e2f84b1d9c03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('note_summary',
+    sa.Column('note_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('book_title', sa.String(length=250), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('author_name', sa.String(length=250), nullable=False),
+    sa.Column('chapter_id', sa.Integer(), nullable=False),
+    sa.Column('chapter_name', sa.String(length=250), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_date', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['note_id'], ['note.id'], ),
+    sa.PrimaryKeyConstraint('note_id')
+    )
+    op.create_index('ix_note_summary_author_id_book_id', 'note_summary',
+                    ['author_id', 'book_id'], unique=False)
+    op.create_index('ix_note_summary_book_id_note_id', 'note_summary',
+                    ['book_id', 'note_id'], unique=False)
+    op.execute(
+        "INSERT INTO note_summary (note_id, book_id, book_title, author_id, author_name, "
+        "chapter_id, chapter_name, content, created_date) "
+        "SELECT note.id, book.id, book.title, author.id, author.name, "
+        "chapter.id, chapter.chapter_name, note.content, note.created_date "
+        "FROM note JOIN book ON book.id = note.book_id "
+        "JOIN author ON author.id = book.author_id "
+        "JOIN chapter ON chapter.id = note.chapter_id"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_note_summary_book_id_note_id', table_name='note_summary')
+    op.drop_index('ix_note_summary_author_id_book_id', table_name='note_summary')
+    op.drop_table('note_summary')
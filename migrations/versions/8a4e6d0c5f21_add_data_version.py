@@ -0,0 +1,36 @@
+"""add data version
+
+Revision ID: 8a4e6d0c5f21
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-17 10:05:00.000000
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6d0c5f21'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    data_version = op.create_table('data_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Seed the single row, so concurrent writers always update and lock it
+    # instead of racing to insert it
+    op.bulk_insert(data_version, [
+        {'id': 1, 'version': 0, 'updated_at': datetime.now(timezone.utc)},
+    ])
+
+
+def downgrade():
+    op.drop_table('data_version')
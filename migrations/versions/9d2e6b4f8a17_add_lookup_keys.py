@@ -0,0 +1,66 @@
+"""add lookup keys
+
+Revision ID: 9d2e6b4f8a17
+Revises: 4e8c1a7d3b95
+Create Date: 2026-10-17 15:30:00.000000
+
+"""
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2e6b4f8a17'
+down_revision = '4e8c1a7d3b95'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# Table, source column and lookup key column
+LOOKUP_KEYS = (('author', 'name', 'name_key'), ('book', 'title', 'title_key'))
+
+
+def _lookup_key(text):
+    """
+    Same normalization as models.lookup_key, copied so the migration does not change with it.
+    """
+
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def upgrade():
+    connection = op.get_bind()
+    for table_name, column, key_column in LOOKUP_KEYS:
+        op.add_column(table_name, sa.Column(key_column, sa.String(length=250), nullable=True))
+
+        table = sa.table(table_name, sa.column('id', sa.Integer), sa.column(column, sa.String),
+                         sa.column(key_column, sa.String))
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                sa.select(table.c.id, table.c[column])
+                .where(table.c.id > last_id).order_by(table.c.id).limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            connection.execute(
+                table.update().where(table.c.id == sa.bindparam('row_id'))
+                .values({key_column: sa.bindparam('key')}),
+                [{'row_id': row_id, 'key': _lookup_key(text)} for row_id, text in rows]
+            )
+            last_id = rows[-1].id
+
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.alter_column(key_column, existing_type=sa.String(length=250), nullable=False)
+            batch_op.create_index(batch_op.f(f'ix_{table_name}_{key_column}'), [key_column],
+                                  unique=False)
+
+
+def downgrade():
+    for table_name, _, key_column in LOOKUP_KEYS:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table_name}_{key_column}'))
+            batch_op.drop_column(key_column)
@@ -0,0 +1,35 @@
+"""add lookup indexes
+
+Revision ID: c7b2e91f4a36
+Revises: 8a4e6d0c5f21
+Create Date: 2026-10-17 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7b2e91f4a36'
+down_revision = '8a4e6d0c5f21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_author_name'), 'author', ['name'], unique=True)
+    op.create_index(op.f('ix_book_title'), 'book', ['title'], unique=True)
+    op.create_index(op.f('ix_book_author_id'), 'book', ['author_id'], unique=False)
+    op.create_index('ix_chapter_book_id_chapter_name', 'chapter',
+                    ['book_id', 'chapter_name'], unique=True)
+    op.create_index('ix_note_book_id_chapter_id', 'note', ['book_id', 'chapter_id'], unique=False)
+    op.create_index(op.f('ix_note_chapter_id'), 'note', ['chapter_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_note_chapter_id'), table_name='note')
+    op.drop_index('ix_note_book_id_chapter_id', table_name='note')
+    op.drop_index('ix_chapter_book_id_chapter_name', table_name='chapter')
+    op.drop_index(op.f('ix_book_author_id'), table_name='book')
+    op.drop_index(op.f('ix_book_title'), table_name='book')
+    op.drop_index(op.f('ix_author_name'), table_name='author')
@@ -0,0 +1,79 @@
+"""add note content hash
+
+Revision ID: e2f84b1d9c03
+Revises: 5d9a3c7e2b48
+Create Date: 2026-10-17 10:20:00.000000
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f84b1d9c03'
+down_revision = '5d9a3c7e2b48'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+note = sa.table('note', sa.column('id', sa.Integer), sa.column('content', sa.Text),
+                sa.column('content_hash', sa.String))
+
+
+def upgrade():
+    op.add_column('note', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(note.c.id, note.c.content)
+            .where(note.c.id > last_id).order_by(note.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            note.update().where(note.c.id == sa.bindparam('note_id'))
+            .values(content_hash=sa.bindparam('digest')),
+            [{'note_id': row.id,
+              'digest': hashlib.sha256(row.content.encode('utf-8')).hexdigest()}
+             for row in rows]
+        )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table('note') as batch_op:
+        batch_op.alter_column('content_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.drop_index('ix_note_book_id_chapter_id')
+        batch_op.create_index('ix_note_book_id_chapter_id_content_hash',
+                              ['book_id', 'chapter_id', 'content_hash'], unique=True)
+    _recreate_sqlite_search_triggers()
+
+
+def downgrade():
+    with op.batch_alter_table('note') as batch_op:
+        batch_op.drop_index('ix_note_book_id_chapter_id_content_hash')
+        batch_op.create_index('ix_note_book_id_chapter_id', ['book_id', 'chapter_id'],
+                              unique=False)
+        batch_op.drop_column('content_hash')
+    _recreate_sqlite_search_triggers()
+
+
+def _recreate_sqlite_search_triggers():
+    """
+    SQLite rebuilds the note table in batch mode, which drops the triggers of the search table.
+    """
+
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("CREATE TRIGGER IF NOT EXISTS note_fts_insert AFTER INSERT ON note BEGIN "
+               "INSERT INTO note_fts(rowid, content) VALUES (new.id, new.content); END")
+    op.execute("CREATE TRIGGER IF NOT EXISTS note_fts_delete AFTER DELETE ON note BEGIN "
+               "INSERT INTO note_fts(note_fts, rowid, content) "
+               "VALUES ('delete', old.id, old.content); END")
+    op.execute("CREATE TRIGGER IF NOT EXISTS note_fts_update AFTER UPDATE OF content ON note BEGIN "
+               "INSERT INTO note_fts(note_fts, rowid, content) "
+               "VALUES ('delete', old.id, old.content); "
+               "INSERT INTO note_fts(rowid, content) VALUES (new.id, new.content); END")
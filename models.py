@@ -10,16 +10,93 @@ but an author can have multiple books.
 - Book and Chapter: One-to-many relationship, where a book can have multiple chapters,
 but a chapter belongs to only one book.
 
-- Chapter and Note: One-to-one relationship, where a chapter can have one note,
-and a note is associated with only one chapter.
+- Chapter and Note: One-to-many relationship, where a chapter can have multiple notes
+with different contents, but a note is associated with only one chapter.
 
 - Book and Note: Many-to-one relationship, where a book can have multiple notes,
 but a note belongs to only one book.
+
+The NoteSummary model is a denormalized read model holding every note flattened
+together with its book, author and chapter.
+
+The DataVersion model holds a single counter bumped on every catalog write.
+
+The ChangeLog model records every inserted or updated catalog row, in commit order,
+for the incremental change feed.
+
+Every column the API and the admin interface look rows up by is indexed.
+The API looks authors and books up by a normalized lookup key of their name or title
+(Unicode NFKC, case-folded, whitespace collapsed), stored in an indexed column filled in
+on insert, so every casing and spacing variant of a name is found with one index probe.
+Author names, book titles and chapter names within a book are unique,
+as the admin interface reuses existing rows with the same name.
+Notes are unique by the SHA-256 digest of their content within a chapter,
+so duplicates are found with an index probe instead of comparing whole texts.
+
+The large text columns, author biographies and note contents, are deferred:
+loading a model instance does not read them until they are accessed.
 """
 
+import hashlib
+
+import unicodedata
+
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+from replica import RoutingSession
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+def content_hash(content):
+    """
+    Computes the digest identifying the content of a note.
+
+    Args:
+        content (str): The content of the note.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the content.
+    """
+
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _default_content_hash(context):
+    """
+    Computes the content digest of a note being inserted without one.
+    """
+
+    return content_hash(context.get_current_parameters()['content'])
+
+
+def lookup_key(text):
+    """
+    Computes the key an author name or a book title is looked up by.
+
+    Args:
+        text (str): The name or title.
+
+    Returns:
+        str: The text normalized with NFKC, case-folded, with collapsed whitespace.
+    """
+
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def _default_lookup_key(column):
+    """
+    Builds the default of a lookup key column, computed from another column.
+
+    Args:
+        column (str): The name of the column the key is computed from.
+
+    Returns:
+        function: The column default.
+    """
+
+    return lambda context: lookup_key(context.get_current_parameters()[column])
+
 
 class Book(db.Model):
     """
@@ -28,6 +105,7 @@ class Book(db.Model):
     Attributes:
         id (db.Column): The primary key of the book.
         title (db.Column): The title of the book.
+        title_key (db.Column): The normalized title the API looks the book up by.
         author_id (db.Column): The foreign key referencing the ID of the book's author.
 
     Relationships:
@@ -36,8 +114,10 @@ class Book(db.Model):
     """
 
     id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(250), nullable=False)
-    author_id = db.Column(db.Integer, db.ForeignKey('author.id'), nullable=False)
+    title = db.Column(db.String(250), nullable=False, unique=True, index=True)
+    title_key = db.Column(db.String(250), nullable=False, index=True,
+                          default=_default_lookup_key('title'))
+    author_id = db.Column(db.Integer, db.ForeignKey('author.id'), nullable=False, index=True)
     author = db.relationship('Author', backref=db.backref('book', lazy=True))
 
 class Author(db.Model):
@@ -47,6 +127,7 @@ class Author(db.Model):
     Attributes:
         id (db.Column): The primary key of the author.
         name (db.Column): The name of the author.
+        name_key (db.Column): The normalized name the API looks the author up by.
         biography (db.Column): The biography of the author.
 
     Relationships:
@@ -54,8 +135,10 @@ class Author(db.Model):
     """
 
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(250), nullable=False)
-    biography = db.Column(db.Text, nullable=False)
+    name = db.Column(db.String(250), nullable=False, unique=True, index=True)
+    name_key = db.Column(db.String(250), nullable=False, index=True,
+                         default=_default_lookup_key('name'))
+    biography = db.deferred(db.Column(db.Text, nullable=False))
 
 
 class Chapter(db.Model):
@@ -69,9 +152,13 @@ class Chapter(db.Model):
 
     Relationships:
         book: Relationship to the Book model, establishing a many-to-one relationship.
-        note: Relationship to the Note model, establishing a one-to-one relationship.
+        note: Relationship to the Note model, establishing a one-to-many relationship.
     """
 
+    __table_args__ = (
+        db.Index('ix_chapter_book_id_chapter_name', 'book_id', 'chapter_name', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     book_id = db.Column(db.Integer, db.ForeignKey('book.id'), nullable=False)
     chapter_name = db.Column(db.String(250), nullable=False)
@@ -88,17 +175,104 @@ class Note(db.Model):
         book_id (db.Column): The foreign key referencing the ID of the associated book.
         chapter_id (db.Column): The foreign key referencing the ID of the associated chapter.
         content (db.Column): The content of the note.
+        content_hash (db.Column): The SHA-256 digest of the content, unique within a chapter.
         created_date (db.Column): The date the note was created.
 
     Relationships:
         book: Relationship to the Book model, establishing a many-to-one relationship.
-        chapter: Relationship to the Chapter model, establishing a one-to-one relationship.
+        chapter: Relationship to the Chapter model, establishing a many-to-one relationship.
     """
 
+    __table_args__ = (
+        db.Index('ix_note_book_id_chapter_id_content_hash',
+                 'book_id', 'chapter_id', 'content_hash', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     book_id = db.Column(db.Integer, db.ForeignKey('book.id'), nullable=False)
-    chapter_id = db.Column(db.Integer, db.ForeignKey('chapter.id'), nullable=False)
-    content = db.Column(db.Text, nullable=False)
+    chapter_id = db.Column(db.Integer, db.ForeignKey('chapter.id'), nullable=False, index=True)
+    content = db.deferred(db.Column(db.Text, nullable=False))
+    content_hash = db.Column(db.String(64), nullable=False, default=_default_content_hash)
     created_date = db.Column(db.Date, nullable=False)
     book = db.relationship('Book', backref=db.backref('note', lazy=True))
-    chapter = db.relationship('Chapter', backref=db.backref('note', uselist=False,lazy=True))
+    chapter = db.relationship('Chapter', backref=db.backref('note', lazy=True))
+
+
+class NoteSummary(db.Model):
+    """
+    Model representing the denormalized read model of a note.
+
+    Every row holds a note flattened together with its book, author and chapter,
+    so the read endpoints need no joins. The rows are written in the same transaction
+    as the notes they describe, see read_model.py.
+
+    Attributes:
+        note_id (db.Column): The primary key, referencing the ID of the note.
+        book_id (db.Column): The ID of the book of the note.
+        book_title (db.Column): The title of the book.
+        author_id (db.Column): The ID of the author of the book.
+        author_name (db.Column): The name of the author.
+        chapter_id (db.Column): The ID of the chapter of the note.
+        chapter_name (db.Column): The name of the chapter.
+        content (db.Column): The content of the note.
+        created_date (db.Column): The date the note was created.
+    """
+
+    __tablename__ = 'note_summary'
+    __table_args__ = (
+        db.Index('ix_note_summary_book_id_note_id', 'book_id', 'note_id'),
+        db.Index('ix_note_summary_author_id_book_id', 'author_id', 'book_id'),
+    )
+
+    note_id = db.Column(db.Integer, db.ForeignKey('note.id'), primary_key=True,
+                        autoincrement=False)
+    book_id = db.Column(db.Integer, nullable=False)
+    book_title = db.Column(db.String(250), nullable=False)
+    author_id = db.Column(db.Integer, nullable=False)
+    author_name = db.Column(db.String(250), nullable=False)
+    chapter_id = db.Column(db.Integer, nullable=False)
+    chapter_name = db.Column(db.String(250), nullable=False)
+    content = db.deferred(db.Column(db.Text, nullable=False))
+    created_date = db.Column(db.Date, nullable=False)
+
+
+class DataVersion(db.Model):
+    """
+    Model representing the version of the catalog data.
+
+    The single row of this table is bumped in the same transaction as every write
+    to the catalog, so readers can tell whether anything changed without
+    querying the Book, Author, Chapter and Note tables.
+
+    Attributes:
+        id (db.Column): The primary key of the version row.
+        version (db.Column): The number of committed catalog writes.
+        updated_at (db.Column): The time of the last committed catalog write.
+    """
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+
+class ChangeLog(db.Model):
+    """
+    Model representing a change to a catalog row.
+
+    A row is appended for every inserted or updated author, book, chapter and note,
+    in the same transaction as the change itself. The IDs follow commit order,
+    see changes.py, so they serve as the tokens of the change feed.
+
+    Attributes:
+        id (db.Column): The primary key of the change, increasing in commit order.
+        entity (db.Column): The kind of the changed row: author, book, chapter or note.
+        entity_id (db.Column): The ID of the changed row.
+        changed_at (db.Column): The time of the change.
+    """
+
+    __tablename__ = 'change_log'
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(16), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    changed_at = db.Column(db.DateTime(timezone=True), nullable=False)
@@ -0,0 +1,123 @@
+"""
+Keyset pagination for the API endpoints
+
+The '/get/*' endpoints return their rows in pages ordered by primary key.
+A page is requested with the 'limit' and 'after' query parameters, where 'after'
+is the opaque cursor taken from the 'next' link of the previous page.
+
+The full, unpaginated result stays available with the explicit 'all=true' parameter.
+Ranked results, such as search matches, use the cursor to hold their position in the ranking.
+
+Functions:
+- encode_cursor - Turns the ID of the last row of a page into an opaque cursor
+- decode_cursor - Turns an opaque cursor back into the ID of a row
+- page_args - Reads the pagination parameters of the current request
+- next_link - Builds the 'Link' header pointing to the next page
+"""
+
+import base64
+
+import binascii
+
+from flask import request, url_for
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+CURSOR_PREFIX = 'id:'
+
+
+class PaginationError(ValueError):
+    """
+    Error raised when the pagination parameters of a request are invalid.
+    """
+
+
+def encode_cursor(last_id):
+    """
+    Encodes the ID of the last row of a page as an opaque cursor.
+
+    Args:
+        last_id (int): The primary key of the last row of the page.
+
+    Returns:
+        str: The URL-safe cursor.
+    """
+
+    raw = f'{CURSOR_PREFIX}{last_id}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes an opaque cursor back into the ID of a row.
+
+    Args:
+        cursor (str): The cursor produced by encode_cursor.
+
+    Returns:
+        int: The primary key the next page starts after.
+
+    Raises:
+        PaginationError: If the cursor is malformed.
+    """
+
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as error:
+        raise PaginationError('Invalid cursor') from error
+
+    # isdigit() alone would accept non-ASCII digits such as '²', which int() rejects
+    number = raw[len(CURSOR_PREFIX):]
+    if not raw.startswith(CURSOR_PREFIX) or not (number.isascii() and number.isdecimal()):
+        raise PaginationError('Invalid cursor')
+    return int(number)
+
+
+def page_args():
+    """
+    Reads the pagination parameters of the current request.
+
+    Returns:
+        tuple: The ID to start after (or None) and the page size
+        (or None when the full result was requested with 'all=true').
+
+    Raises:
+        PaginationError: If the limit or the cursor is invalid.
+    """
+
+    if request.args.get('all', '').lower() in ('1', 'true', 'yes'):
+        return None, None
+
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE)
+    try:
+        limit = int(limit)
+    except ValueError as error:
+        raise PaginationError('Limit must be an integer') from error
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise PaginationError(f'Limit must be between 1 and {MAX_PAGE_SIZE}')
+
+    cursor = request.args.get('after')
+    after = decode_cursor(cursor) if cursor else None
+
+    return after, limit
+
+
+def next_link(last_id):
+    """
+    Builds the 'Link' header value pointing to the page after the given row.
+
+    The query parameters of the current request are kept, only the cursor changes.
+
+    Args:
+        last_id (int): The primary key of the last row of the current page.
+
+    Returns:
+        str: The header value with the 'next' relation.
+    """
+
+    args = request.args.to_dict(flat=False)
+    args['after'] = encode_cursor(last_id)
+    url = url_for(request.endpoint, **args)
+    return f'<{url}>; rel="next"'
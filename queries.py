@@ -0,0 +1,380 @@
+"""
+Read layer for the API endpoints
+
+This module builds the JSON payloads returned by the '/get/*' endpoints.
+
+Every function issues a fixed number of queries no matter how many rows are returned.
+The nested catalog is loaded from the catalog tables themselves with one SELECT ... IN
+query per level of the tree.
+Books are read from the book table itself, so books without notes are listed too.
+Notes are read from the denormalized note_summary read model (see read_model.py),
+which already holds every note together with its book title, author and chapter name,
+so no joins are needed.
+
+Every function is paginated by primary key: it returns the rows after the given ID
+and the ID to continue from, which is None on the last page.
+Passing no limit returns every row in a single page.
+
+Every function accepts the names of the fields to return. Only the columns of these fields
+(and the ID, which the pagination needs) are selected, so large text columns such as
+biographies and note contents are never read when a client does not ask for them.
+
+Several books or authors can be requested at once: they are looked up with a single
+IN query and their books or notes are read with another one, grouped by book or author.
+Books and authors are looked up by the normalized lookup keys of their titles and names,
+so '?author=сенека' and '?author=СЕНЕКА' both find 'Сенека' with a single index probe.
+
+Functions:
+- find_books - Books with the given titles, in any case, looked up with a single query
+- find_authors - Authors with the given names, in any case, looked up with a single query
+- all_books - Books of every author
+- books_for_authors - Books of the given authors, grouped by author name
+- all_authors - Authors with their biographies
+- notes_for_books - Notes of the given books with their chapter names, grouped by book title
+- all_notes - Notes with their book titles and chapter names
+- iter_notes - Streams notes from a server-side cursor for full exports
+- catalog - Authors with their books, chapters and notes as a nested tree
+"""
+
+from models import db, Author, Book, Note, NoteSummary, lookup_key
+
+STREAM_BATCH_SIZE = 1000
+
+BOOK_FIELDS = {'id': Book.id, 'title': Book.title}
+
+AUTHOR_FIELDS = {'id': Author.id, 'name': Author.name, 'biography': Author.biography}
+
+NOTE_FIELDS = {'id': NoteSummary.note_id, 'book': NoteSummary.book_title,
+               'content': NoteSummary.content, 'chapter': NoteSummary.chapter_name}
+
+BOOK_NOTE_FIELDS = {name: column for name, column in NOTE_FIELDS.items() if name != 'book'}
+
+
+def _columns(available, fields):
+    """
+    Selects the labelled columns of the requested fields.
+
+    Args:
+        available (dict): The columns of every field, by field name.
+        fields (iterable): The names of the requested fields, or None for every field.
+
+    Returns:
+        list: The columns labelled with their field names, always starting with the ID.
+    """
+
+    names = ['id'] + [name for name in (fields or available) if name != 'id']
+    return [available[name].label(name) for name in dict.fromkeys(names)]
+
+
+def _keyset(statement, column, after, limit):
+    """
+    Executes a statement restricted to a single page ordered by the given column.
+
+    One extra row is fetched to find out whether another page follows.
+
+    Args:
+        statement (Select): The statement to execute.
+        column (Column): The primary key column used for ordering.
+        after (int): The ID the page starts after, or None for the first page.
+        limit (int): The page size, or None for every row.
+
+    Returns:
+        tuple: The rows of the page and the ID to continue from (or None).
+    """
+
+    if after is not None:
+        statement = statement.where(column > after)
+    statement = statement.order_by(column)
+
+    if limit is None:
+        return db.session.execute(statement).all(), None
+
+    rows = db.session.execute(statement.limit(limit + 1)).all()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
+
+
+def _group(rows, group_column, names):
+    """
+    Groups rows by the name of the book or author they belong to.
+
+    Args:
+        rows (list): The rows, each with the group column.
+        group_column (str): The name of the column holding the ID of the group.
+        names (dict): The name of every group, by ID.
+
+    Returns:
+        dict: The rows as dictionaries without the group ID, by group name, in row order.
+    """
+
+    grouped = {}
+    for row in rows:
+        item = row._asdict()
+        grouped.setdefault(names[item.pop(group_column)], []).append(item)
+    return grouped
+
+
+def _find(column, key_column, keys):
+    """
+    Looks up the rows with the given keys with a single IN query on their lookup keys.
+
+    Keys are matched regardless of case, Unicode normalization form and whitespace
+    (see models.lookup_key); a row whose name equals the key exactly is preferred
+    over another row with the same lookup key.
+
+    A key containing commas is split into several keys, unless a row matches it whole,
+    so '?book=a,b' requests two books while a title containing a comma still matches.
+
+    Args:
+        column (Column): The unique column holding the names of the rows.
+        key_column (Column): The indexed column holding the lookup keys of the names.
+        keys (iterable): The requested keys, as given in the query string.
+
+    Returns:
+        tuple: The found rows in request order and the keys without a row.
+    """
+
+    keys = [key.strip() for key in keys if key.strip()]
+    parts = {key: [part.strip() for part in key.split(',') if part.strip()] for key in keys}
+    candidates = set(keys).union(*parts.values())
+
+    entity = column.class_
+    rows = db.session.execute(
+        db.select(entity).where(key_column.in_({lookup_key(key) for key in candidates}))
+        .order_by(entity.id)).scalars().all()
+    by_name = {getattr(row, column.key): row for row in rows}
+    by_key = {}
+    for row in rows:
+        by_key.setdefault(getattr(row, key_column.key), row)
+    found = {key: by_name.get(key) or by_key.get(lookup_key(key)) for key in candidates}
+    found = {key: row for key, row in found.items() if row is not None}
+
+    resolved = []
+    for key in keys:
+        resolved.extend([key] if key in found or ',' not in key else parts[key])
+    resolved = list(dict.fromkeys(resolved))
+    return (list({found[key].id: found[key] for key in resolved if key in found}.values()),
+            [key for key in resolved if key not in found])
+
+
+def find_books(titles):
+    """
+    Looks up books by their titles with a single query.
+
+    Args:
+        titles (iterable): The requested titles, possibly comma-separated.
+
+    Returns:
+        tuple: The found books in request order and the titles without a book.
+    """
+
+    return _find(Book.title, Book.title_key, titles)
+
+
+def find_authors(names):
+    """
+    Looks up authors by their names with a single query.
+
+    Args:
+        names (iterable): The requested names, possibly comma-separated.
+
+    Returns:
+        tuple: The found authors in request order and the names without an author.
+    """
+
+    return _find(Author.name, Author.name_key, names)
+
+
+def all_books(after=None, limit=None, fields=None):
+    """
+    Collects the books of every author.
+
+    Args:
+        after (int): The ID the page starts after.
+        limit (int): The page size.
+        fields (iterable): The names of the fields to return, or None for every field.
+
+    Returns:
+        tuple: The books as dictionaries and the ID to continue from.
+    """
+
+    statement = db.select(*_columns(BOOK_FIELDS, fields))
+
+    rows, next_id = _keyset(statement, Book.id, after, limit)
+    return [row._asdict() for row in rows], next_id
+
+
+def books_for_authors(authors, after=None, limit=None, fields=None):
+    """
+    Collects the books of the given authors with a single query.
+
+    Args:
+        authors (list): The authors whose books should be collected.
+        after (int): The ID the page starts after.
+        limit (int): The page size.
+        fields (iterable): The names of the fields to return, or None for every field.
+
+    Returns:
+        tuple: The books as dictionaries grouped by author name, and the ID to continue from.
+    """
+
+    names = {author.id: author.name for author in authors}
+    statement = db.select(
+        Book.author_id.label('author_id'), *_columns(BOOK_FIELDS, fields)
+    ).where(Book.author_id.in_(names))
+
+    rows, next_id = _keyset(statement, Book.id, after, limit)
+    return _group(rows, 'author_id', names), next_id
+
+
+def all_authors(after=None, limit=None, fields=None):
+    """
+    Collects authors with their biographies.
+
+    Args:
+        after (int): The ID the page starts after.
+        limit (int): The page size.
+        fields (iterable): The names of the fields to return, or None for every field.
+
+    Returns:
+        tuple: The authors as dictionaries and the ID to continue from.
+    """
+
+    statement = db.select(*_columns(AUTHOR_FIELDS, fields))
+
+    rows, next_id = _keyset(statement, Author.id, after, limit)
+    return [row._asdict() for row in rows], next_id
+
+
+def notes_for_books(books, after=None, limit=None, fields=None):
+    """
+    Collects the notes of the given books with their chapter names, with a single query.
+
+    Args:
+        books (list): The books whose notes should be collected.
+        after (int): The ID the page starts after.
+        limit (int): The page size.
+        fields (iterable): The names of the fields to return, or None for every field.
+
+    Returns:
+        tuple: The notes as dictionaries grouped by book title, and the ID to continue from.
+    """
+
+    titles = {book.id: book.title for book in books}
+    statement = db.select(
+        NoteSummary.book_id.label('book_id'), *_columns(BOOK_NOTE_FIELDS, fields)
+    ).where(NoteSummary.book_id.in_(titles))
+
+    rows, next_id = _keyset(statement, NoteSummary.note_id, after, limit)
+    return _group(rows, 'book_id', titles), next_id
+
+
+def all_notes(after=None, limit=None, fields=None):
+    """
+    Collects notes with their book titles and chapter names.
+
+    Args:
+        after (int): The ID the page starts after.
+        limit (int): The page size.
+        fields (iterable): The names of the fields to return, or None for every field.
+
+    Returns:
+        tuple: The notes as dictionaries and the ID to continue from.
+    """
+
+    statement = db.select(*_columns(NOTE_FIELDS, fields))
+
+    rows, next_id = _keyset(statement, NoteSummary.note_id, after, limit)
+    return [row._asdict() for row in rows], next_id
+
+
+def iter_notes(books=None, after=None, batch_size=STREAM_BATCH_SIZE, fields=None):
+    """
+    Streams notes with their book titles and chapter names.
+
+    The rows are read from a server-side cursor in batches of the given size,
+    so memory use does not depend on the number of notes.
+
+    Args:
+        books (list): The books whose notes should be streamed, or None for all notes.
+        after (int): The ID the stream starts after.
+        batch_size (int): The number of rows fetched from the database at once.
+        fields (iterable): The names of the fields to return, or None for every field.
+
+    Yields:
+        dict: The notes ordered by ID.
+    """
+
+    statement = (
+        db.select(*_columns(NOTE_FIELDS, fields))
+        .order_by(NoteSummary.note_id)
+        .execution_options(yield_per=batch_size)
+    )
+    if books is not None:
+        statement = statement.where(NoteSummary.book_id.in_([book.id for book in books]))
+    if after is not None:
+        statement = statement.where(NoteSummary.note_id > after)
+
+    for row in db.session.execute(statement):
+        yield row._asdict()
+
+
+def catalog(authors=None, after=None, limit=None):
+    """
+    Collects authors with their books, the chapters of every book and the notes of every chapter.
+
+    The authors are read with one query and every level below them with one
+    SELECT ... IN query over the IDs of the level above, so the tree costs
+    four queries however large it is. A chapter can hold several notes,
+    which are listed in ID order.
+
+    Args:
+        authors (list): The authors to collect, or None for every author.
+        after (int): The author ID the page starts after.
+        limit (int): The number of authors per page.
+
+    Returns:
+        tuple: The authors as nested dictionaries and the author ID to continue from.
+    """
+
+    statement = db.select(Author).options(
+        db.undefer(Author.biography),
+        db.selectinload(Author.book).selectinload(Book.chapter)
+    ).order_by(Author.id)
+    if authors is not None:
+        statement = statement.where(Author.id.in_([author.id for author in authors]))
+    if after is not None:
+        statement = statement.where(Author.id > after)
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+
+    rows = db.session.execute(statement).scalars().all()
+    next_id = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_id = rows[-1].id
+
+    chapter_ids = [chapter.id for author in rows for book in author.book
+                   for chapter in book.chapter]
+    notes = {}
+    if chapter_ids:
+        for note in db.session.execute(
+                db.select(Note.id, Note.chapter_id, Note.content, Note.created_date)
+                .where(Note.chapter_id.in_(chapter_ids)).order_by(Note.id)):
+            notes.setdefault(note.chapter_id, []).append(
+                {'id': note.id, 'content': note.content,
+                 'created_date': note.created_date.isoformat()})
+
+    def chapter_payload(chapter):
+        return {'id': chapter.id, 'name': chapter.chapter_name,
+                'notes': notes.get(chapter.id, [])}
+
+    return [{
+        'id': author.id, 'name': author.name, 'biography': author.biography,
+        'books': [{
+            'id': book.id, 'title': book.title,
+            'chapters': [chapter_payload(chapter)
+                         for chapter in sorted(book.chapter, key=lambda chapter: chapter.id)],
+        } for book in sorted(author.book, key=lambda book: book.id)],
+    } for author in rows], next_id
@@ -0,0 +1,83 @@
+"""
+Denormalized read model of the notes
+
+The note_summary table holds every note flattened together with its book title,
+author name and chapter name, so '/get/notes' reads it without joins.
+
+The table is maintained incrementally: every write path inserts the summary rows of its new
+notes in the same transaction, with a single INSERT ... SELECT over the joined tables.
+This keeps the read model consistent with the catalog at every commit on PostgreSQL and SQLite
+alike, without rescanning the catalog the way a materialized view refresh would.
+The 'flask rebuild-read-model' command rebuilds the whole table, for example after manual edits.
+
+Functions:
+- add_note_summaries - Inserts the summary rows of the given notes
+- rebuild_note_summaries - Rebuilds the whole summary table
+- rebuild_read_model_command - The 'flask rebuild-read-model' command
+"""
+
+import click
+
+from flask.cli import with_appcontext
+
+from models import db, Author, Book, Chapter, Note, NoteSummary
+
+from versioning import bump_data_version
+
+SUMMARY_COLUMNS = ['note_id', 'book_id', 'book_title', 'author_id', 'author_name',
+                   'chapter_id', 'chapter_name', 'content', 'created_date']
+
+
+def _summary_select():
+    """
+    Builds the SELECT flattening notes with their book, author and chapter.
+
+    Returns:
+        Select: The statement returning the columns of the summary table.
+    """
+
+    return (
+        db.select(Note.id, Book.id, Book.title, Author.id, Author.name,
+                  Chapter.id, Chapter.chapter_name, Note.content, Note.created_date)
+        .join(Note.book)
+        .join(Book.author)
+        .join(Note.chapter)
+    )
+
+
+def add_note_summaries(note_ids):
+    """
+    Inserts the summary rows of the given notes in the current transaction.
+
+    Args:
+        note_ids (list): The IDs of the new notes.
+    """
+
+    if not note_ids:
+        return
+    db.session.execute(
+        db.insert(NoteSummary).from_select(
+            SUMMARY_COLUMNS, _summary_select().where(Note.id.in_(note_ids)))
+    )
+
+
+def rebuild_note_summaries():
+    """
+    Rebuilds the whole summary table in the current transaction.
+    """
+
+    db.session.execute(db.delete(NoteSummary))
+    db.session.execute(db.insert(NoteSummary).from_select(SUMMARY_COLUMNS, _summary_select()))
+
+
+@click.command('rebuild-read-model')
+@with_appcontext
+def rebuild_read_model_command():
+    """
+    Rebuild the denormalized note read model from the catalog tables.
+    """
+
+    rebuild_note_summaries()
+    bump_data_version()
+    db.session.commit()
+    click.echo(f'Rebuilt {db.session.query(NoteSummary).count()} note summaries')
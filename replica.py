@@ -0,0 +1,71 @@
+"""
+Read-replica routing
+
+When a read replica is configured, the views marked with the read_replica decorator
+read from it, while everything else, including every write and flush, goes to the primary.
+Internal requests that must see the latest commit, such as the snapshot rebuilt after
+an admin write, set PRIMARY_READS_KEY in their WSGI environment to read from the primary.
+
+Classes:
+- RoutingSession - Session choosing the replica engine for reads of marked views
+
+Functions:
+- read_replica - Decorator marking a view as safe to serve from the replica
+"""
+
+from flask import current_app, has_request_context, request
+
+from flask_sqlalchemy.session import Session
+
+from sqlalchemy.sql.dml import UpdateBase
+
+from config import REPLICA_BIND
+
+PRIMARY_READS_KEY = 'philosophy_api.primary_reads'
+
+
+def read_replica(view):
+    """
+    Decorator marking a view as safe to serve from the read replica.
+
+    Args:
+        view (callable): The view function.
+
+    Returns:
+        callable: The same view function, marked.
+    """
+
+    view.use_read_replica = True
+    return view
+
+
+def _reads_from_replica():
+    """
+    Checks whether the current request is handled by a view marked with read_replica.
+
+    Returns:
+        bool: True if the reads of the request may go to the replica.
+    """
+
+    if not has_request_context() or request.endpoint is None:
+        return False
+    if request.environ.get(PRIMARY_READS_KEY):
+        return False
+    view = current_app.view_functions.get(request.endpoint)
+    return getattr(view, 'use_read_replica', False)
+
+
+class RoutingSession(Session):
+    """
+    Session sending the reads of views marked with read_replica to the replica engine.
+
+    Writes, flushes and explicit binds always use the default routing.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and not isinstance(clause, UpdateBase)
+                and _reads_from_replica()):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
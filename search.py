@@ -0,0 +1,127 @@
+"""
+Full-text search over notes
+
+On PostgreSQL every note carries a generated 'search_vector' tsvector column
+with a GIN index. On SQLite the notes are mirrored into an FTS5 virtual table
+kept in sync by triggers, so the search can be tested locally.
+
+Both use a language-neutral tokenizer that folds case, so Cyrillic notes are found
+regardless of the casing of the query. The DDL is attached to the creation of the
+note table, so db.create_all() and the migrations produce the same schema.
+
+Functions:
+- search_notes - Ranked page of notes matching a query, with their book and chapter
+- include_object - Keeps the search objects out of Alembic autogenerate
+"""
+
+from sqlalchemy import DDL, column, event, func, literal_column, table
+
+from models import db, Book, Note, Chapter
+
+SEARCH_CONFIG = 'simple'
+
+POSTGRESQL_DDL = (
+    "ALTER TABLE note ADD COLUMN search_vector tsvector "
+    f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', content)) STORED",
+    "CREATE INDEX ix_note_search_vector ON note USING GIN (search_vector)",
+)
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE note_fts USING fts5(content, content='note', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER note_fts_insert AFTER INSERT ON note BEGIN "
+    "INSERT INTO note_fts(rowid, content) VALUES (new.id, new.content); END",
+    "CREATE TRIGGER note_fts_delete AFTER DELETE ON note BEGIN "
+    "INSERT INTO note_fts(note_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+    "CREATE TRIGGER note_fts_update AFTER UPDATE OF content ON note BEGIN "
+    "INSERT INTO note_fts(note_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    "INSERT INTO note_fts(rowid, content) VALUES (new.id, new.content); END",
+)
+
+SEARCH_OBJECTS = ('search_vector', 'ix_note_search_vector', 'note_fts')
+
+note_fts = table('note_fts', column('rowid'))
+
+for statement in POSTGRESQL_DDL:
+    event.listen(Note.__table__, 'after_create',
+                 DDL(statement).execute_if(dialect='postgresql'))
+for statement in SQLITE_DDL:
+    event.listen(Note.__table__, 'after_create',
+                 DDL(statement).execute_if(dialect='sqlite'))
+event.listen(Note.__table__, 'before_drop',
+             DDL('DROP TABLE IF EXISTS note_fts').execute_if(dialect='sqlite'))
+
+
+def include_object(obj, name, type_, reflected, compare_to):  # pylint: disable=unused-argument
+    """
+    Tells Alembic autogenerate to ignore the objects created for the search.
+
+    Returns:
+        bool: False for the search column, index and virtual table, True otherwise.
+    """
+
+    return name not in SEARCH_OBJECTS and not (name or '').startswith('note_fts_')
+
+
+def _fts5_query(query):
+    """
+    Turns free text into an FTS5 query matching every word.
+
+    Every word is quoted, so FTS5 operators in the text are matched literally.
+
+    Args:
+        query (str): The text entered by the client.
+
+    Returns:
+        str: The FTS5 query.
+    """
+
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+def search_notes(query, offset=0, limit=None):
+    """
+    Collects the notes matching a query, best matches first.
+
+    Args:
+        query (str): The text to search for.
+        offset (int): The number of best matches to skip.
+        limit (int): The page size, or None for every match.
+
+    Returns:
+        tuple: The notes as dictionaries with their book titles and chapter names,
+        and the offset of the next page (or None on the last page).
+    """
+
+    statement = (
+        db.select(Note.id, Book.title, Note.content, Chapter.chapter_name)
+        .join(Note.book)
+        .join(Note.chapter)
+    )
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        vector = literal_column('note.search_vector')
+        ts_query = func.plainto_tsquery(SEARCH_CONFIG, query)
+        statement = (
+            statement.where(vector.op('@@')(ts_query))
+            .order_by(func.ts_rank(vector, ts_query).desc(), Note.id)
+        )
+    else:
+        statement = (
+            statement.join(note_fts, note_fts.c.rowid == Note.id)
+            .where(literal_column('note_fts').op('MATCH')(_fts5_query(query)))
+            .order_by(func.bm25(literal_column('note_fts')), Note.id)
+        )
+
+    statement = statement.offset(offset or 0)
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+
+    rows = db.session.execute(statement).all()
+    next_offset = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = (offset or 0) + limit
+
+    return [{'id': row.id, 'book': row.title, 'content': row.content,
+             'chapter': row.chapter_name} for row in rows], next_offset
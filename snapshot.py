@@ -0,0 +1,326 @@
+"""
+Pre-compressed snapshots of the unfiltered catalog reads
+
+Most requests are identical unfiltered reads of '/get/all_books', '/get/authors' and
+'/get/notes'. The 'flask build-snapshot' command renders these responses once, through
+the application itself, and writes them to a directory as plain, gzip and brotli files
+whose names contain a digest of their content. A manifest.json file maps every request
+to its files, its 'Link' header and its entity tag.
+
+The files can be served by nginx or a CDN. With the SNAPSHOT_SERVE setting enabled,
+the application serves them itself: matching requests are answered from the files,
+with the 'Content-Encoding' negotiated from 'Accept-Encoding', before the view runs,
+so no database query is made. Like the compressed responses of the application,
+the gzip and brotli files are served with a weak entity tag. Any other request
+is handled as usual.
+
+Brotli files are only written when the optional 'brotli' package is installed.
+
+With the SNAPSHOT_ON_WRITE setting enabled, the admin interface rebuilds the snapshot
+after every submission, in a background thread: the rendered requests get their own
+application contexts instead of sharing 'g' and the database session of the admin request,
+they read from the primary database, and a failed build is logged without failing
+the submission, which is already committed.
+
+Functions:
+- build_snapshot - Renders the snapshot requests and writes their files to a directory
+- rebuild_snapshot_in_background - Rebuilds the snapshot of an application in a background thread
+- init_snapshot - Serves matching requests from the snapshot files when enabled
+- build_snapshot_command - The 'flask build-snapshot' command
+"""
+
+import gzip
+
+import hashlib
+
+import json
+
+import logging
+
+import os
+
+import re
+
+import threading
+
+from urllib.parse import parse_qsl, urlencode
+
+import click
+
+from flask import current_app, request, send_file
+
+from flask.cli import with_appcontext
+
+from werkzeug.datastructures import MultiDict
+
+from replica import PRIMARY_READS_KEY
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+SNAPSHOT_URLS = (
+    '/get/all_books', '/get/all_books?all=true',
+    '/get/authors', '/get/authors?all=true',
+    '/get/notes', '/get/notes?all=true',
+)
+
+MANIFEST_NAME = 'manifest.json'
+
+BUILD_KEY = 'philosophy_api.snapshot_build'
+
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+SNAPSHOT_FILE_PATTERN = r'{stem}\.[0-9a-f]{{16}}\.json(?:\.gz|\.br)?'
+
+REBUILD_THREAD_NAME = 'snapshot-rebuild'
+
+logger = logging.getLogger(__name__)
+
+_manifests = {}
+
+# Serializes the builds of the background threads, which write the same temporary files
+_build_lock = threading.Lock()
+
+
+def _request_key(path, args):
+    """
+    Builds the manifest key of a request from its path and query arguments.
+
+    Args:
+        path (str): The path of the request.
+        args (MultiDict): The query arguments.
+
+    Returns:
+        str: The path followed by the sorted query string.
+    """
+
+    return f'{path}?{urlencode(sorted(args.items(multi=True)))}'
+
+
+def _file_stem(url):
+    """
+    Derives the file name prefix of a snapshot URL.
+
+    Args:
+        url (str): The URL, for example '/get/notes?all=true'.
+
+    Returns:
+        str: The prefix, for example 'notes.all-true'.
+    """
+
+    path, _, query = url.partition('?')
+    stem = path.rstrip('/').rsplit('/', 1)[-1]
+    if query:
+        stem += '.' + query.replace('=', '-').replace('&', '.')
+    return stem
+
+
+def _write_atomic(path, data):
+    """
+    Writes a file through a temporary file, so readers never see a partial file.
+
+    Args:
+        path (str): The path of the file.
+        data (bytes): The content.
+    """
+
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+
+def build_snapshot(app, directory, urls=SNAPSHOT_URLS):
+    """
+    Renders the given requests and writes their responses to a directory.
+
+    The requests are read from the primary database, so the snapshot holds the latest
+    committed writes even when a read replica lags behind.
+
+    Every successful response is written as '<stem>.<digest>.json' together with its
+    '.gz' and '.br' variants. The manifest is replaced last and the files of the given URLs
+    it no longer references are removed afterwards, so a concurrent reader always finds
+    the files listed in the manifest it has read. Other files in the directory are kept.
+
+    Args:
+        app (Flask): The application rendering the responses.
+        directory (str): The directory the files are written to.
+        urls (iterable): The URLs of the requests to render.
+
+    Returns:
+        dict: The written manifest.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    client = app.test_client()
+    entries = {}
+
+    for url in urls:
+        response = client.get(url, environ_overrides={BUILD_KEY: True, PRIMARY_READS_KEY: True})
+        if response.status_code != 200:
+            continue
+
+        body = response.get_data()
+        name = f'{_file_stem(url)}.{hashlib.sha256(body).hexdigest()[:16]}.json'
+        encodings = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encodings['br'] = brotli.compress(body, quality=11)
+
+        _write_atomic(os.path.join(directory, name), body)
+        for encoding, data in encodings.items():
+            _write_atomic(os.path.join(directory, name + ENCODING_SUFFIXES[encoding]), data)
+
+        path, _, query = url.partition('?')
+        entries[_request_key(path, MultiDict(parse_qsl(query)))] = {
+            'file': name,
+            'encodings': sorted(encodings),
+            'etag': response.get_etag()[0],
+            'link': response.headers.get('Link'),
+        }
+
+    manifest = {'entries': entries}
+    _write_atomic(os.path.join(directory, MANIFEST_NAME),
+                  json.dumps(manifest, indent=2, sort_keys=True).encode())
+
+    referenced = set()
+    for entry in entries.values():
+        referenced.add(entry['file'])
+        referenced.update(entry['file'] + ENCODING_SUFFIXES[encoding]
+                          for encoding in entry['encodings'])
+    # Only files written by a build of the same URLs are removed, never other files
+    written = re.compile('|'.join(SNAPSHOT_FILE_PATTERN.format(stem=re.escape(_file_stem(url)))
+                                  for url in urls))
+    for name in os.listdir(directory):
+        if name not in referenced and written.fullmatch(name):
+            os.remove(os.path.join(directory, name))
+
+    return manifest
+
+
+def _rebuild_snapshot(app, directory):
+    """
+    Rebuilds the snapshot of an application, logging instead of raising failures.
+
+    Args:
+        app (Flask): The application rendering the responses.
+        directory (str): The directory the files are written to.
+    """
+
+    try:
+        with _build_lock:
+            build_snapshot(app, directory)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.exception('Rebuilding the snapshot in %s failed', directory)
+
+
+def rebuild_snapshot_in_background(app):
+    """
+    Rebuilds the snapshot of an application in a background thread.
+
+    The thread does not push an application context of its own, so every rendered
+    request gets a fresh one, independent of the request that started the rebuild.
+
+    Args:
+        app (Flask): The application, with the SNAPSHOT_DIR setting.
+
+    Returns:
+        Thread: The started thread.
+    """
+
+    thread = threading.Thread(target=_rebuild_snapshot, args=(app, app.config['SNAPSHOT_DIR']),
+                              name=REBUILD_THREAD_NAME, daemon=True)
+    thread.start()
+    return thread
+
+
+def _load_manifest(directory):
+    """
+    Reads the manifest of a snapshot directory, reusing it until the file changes.
+
+    Args:
+        directory (str): The snapshot directory.
+
+    Returns:
+        dict: The manifest entries, or an empty dictionary if there is no snapshot.
+    """
+
+    path = os.path.join(directory, MANIFEST_NAME)
+    try:
+        modified = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    cached = _manifests.get(path)
+    if cached is None or cached[0] != modified:
+        with open(path, encoding='utf-8') as file:
+            cached = (modified, json.load(file)['entries'])
+        _manifests[path] = cached
+    return cached[1]
+
+
+def _serve_snapshot():
+    """
+    Answers the current request from the snapshot files if it is part of the snapshot.
+
+    Returns:
+        Response: The file response, or None to handle the request as usual.
+    """
+
+    if request.method != 'GET' or request.environ.get(BUILD_KEY):
+        return None
+
+    directory = current_app.config['SNAPSHOT_DIR']
+    entry = _load_manifest(directory).get(_request_key(request.path, request.args))
+    if entry is None:
+        return None
+
+    name, encoding = entry['file'], None
+    for candidate in ('br', 'gzip'):
+        if candidate in entry['encodings'] and request.accept_encodings[candidate]:
+            name, encoding = name + ENCODING_SUFFIXES[candidate], candidate
+            break
+
+    try:
+        response = send_file(os.path.join(os.path.abspath(directory), name),
+                             mimetype='application/json', etag=entry['etag'],
+                             conditional=True, max_age=None)
+    except FileNotFoundError:
+        # Removed by a concurrent build after the manifest was read
+        return None
+    del response.headers['Content-Disposition']
+    if encoding:
+        # The compressed bytes differ from the identity file, see compression.py
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(entry['etag'], weak=True)
+    response.vary.add('Accept-Encoding')
+    if entry['link']:
+        response.headers['Link'] = entry['link']
+    return response
+
+
+def init_snapshot(app):
+    """
+    Serves the snapshot requests from the snapshot files when SNAPSHOT_SERVE is enabled.
+
+    Args:
+        app (Flask): The application.
+    """
+
+    if app.config.get('SNAPSHOT_SERVE'):
+        app.before_request(_serve_snapshot)
+
+
+@click.command('build-snapshot')
+@click.option('--directory', type=click.Path(file_okay=False),
+              help='Directory to write to, SNAPSHOT_DIR by default.')
+@with_appcontext
+def build_snapshot_command(directory):
+    """
+    Write pre-compressed snapshots of the unfiltered catalog reads.
+    """
+
+    directory = directory or current_app.config['SNAPSHOT_DIR']
+    manifest = build_snapshot(current_app, directory)
+    click.echo(f'Wrote {len(manifest["entries"])} snapshot responses to {directory}')
@@ -0,0 +1,130 @@
+"""
+Prefix autocomplete of author names and book titles
+
+Every worker keeps the author names and book titles in memory, folded for matching:
+normalized with NFKD, stripped of diacritics and case-folded, so 'сенека' finds 'Сенека'
+and 'epictete' finds 'Épictète'. Every word of a name is indexed, so 'sen' also finds
+'Lucius Annaeus Seneca'.
+
+The folded keys are kept in a sorted list: a lookup is a binary search for the first key
+starting with the query followed by a scan of the matches, so it takes microseconds
+however many authors and books there are.
+
+The index remembers the data version it was built from and is rebuilt on the first lookup
+after a catalog write by any worker; the worker making the write refreshes it right away.
+
+Functions:
+- fold - Folds text for case- and diacritic-insensitive matching
+
+Classes:
+- SuggestIndex - Sorted in-memory index of author names and book titles
+
+Variables:
+- suggest_index - The index used by the '/get/suggest' endpoint
+"""
+
+import bisect
+
+import threading
+
+import unicodedata
+
+from models import db, Author, Book
+
+SUGGEST_TYPES = {
+    'author': (Author, 'name'),
+    'book': (Book, 'title'),
+}
+
+
+def fold(text):
+    """
+    Folds text for case- and diacritic-insensitive matching.
+
+    Args:
+        text (str): The text to fold.
+
+    Returns:
+        str: The text without diacritics, case-folded, with collapsed whitespace.
+    """
+
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+class SuggestIndex:
+    """
+    Sorted in-memory index of author names and book titles.
+
+    Attributes:
+        version (int): The data version the index was built from, or None before the first build.
+
+    Methods:
+        refresh: Rebuild the index from the database.
+        lookup: Return the entries starting with a prefix.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._keys = {kind: [] for kind in SUGGEST_TYPES}
+        self._entries = {kind: [] for kind in SUGGEST_TYPES}
+        self._lock = threading.Lock()
+
+    def refresh(self, version):
+        """
+        Rebuild the index from the database.
+
+        Args:
+            version (int): The current data version.
+        """
+
+        keys, entries = {}, {}
+        for kind, (model, attribute) in SUGGEST_TYPES.items():
+            column = getattr(model, attribute)
+            indexed = []
+            for row_id, text in db.session.execute(db.select(model.id, column)):
+                words = fold(text).split(' ')
+                for position in range(len(words)):
+                    indexed.append((' '.join(words[position:]), row_id, text))
+            indexed.sort()
+            keys[kind] = [key for key, _, _ in indexed]
+            entries[kind] = [(row_id, text) for _, row_id, text in indexed]
+
+        with self._lock:
+            self._keys, self._entries, self.version = keys, entries, version
+
+    def lookup(self, kind, prefix, limit, version):
+        """
+        Return the entries with a word starting with a prefix, rebuilding the index if outdated.
+
+        Args:
+            kind (str): 'author' or 'book'.
+            prefix (str): The text typed by the client.
+            limit (int): The maximum number of entries.
+            version (int): The current data version.
+
+        Returns:
+            list: The matching entries as (ID, name) tuples, in folded alphabetical order.
+        """
+
+        if version != self.version:
+            with self._lock:
+                outdated = version != self.version
+            if outdated:
+                self.refresh(version)
+
+        with self._lock:
+            keys, entries = self._keys[kind], self._entries[kind]
+
+        prefix = fold(prefix)
+        found = {}
+        position = bisect.bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix) and len(found) < limit:
+            row_id, text = entries[position]
+            found.setdefault(row_id, text)
+            position += 1
+        return list(found.items())
+
+
+suggest_index = SuggestIndex()
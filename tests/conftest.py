@@ -5,6 +5,9 @@ performing Selenium tests on a Flask application.
 
 The file sets up a Selenium WebDriver instance using the Chrome WebDriver and provides
 fixtures for managing the WebDriver during the test session.
+
+It also provides a fixture with a throwaway SQLite database for testing
+the read layer without a running PostgreSQL server.
 """
 
 import sys
@@ -13,6 +16,8 @@ import os
 
 import pytest
 
+from flask import Flask
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -20,6 +25,8 @@ from selenium.webdriver.common.by import By
 # Add the parent directory of the current file to the system path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from models import db  # pylint: disable=wrong-import-position
+
 
 @pytest.fixture(scope='session')
 def browser():
@@ -104,3 +111,27 @@ def authenticated_browser():
     driver.get('http://localhost:5000/logout')
 
     driver.quit()
+
+
+@pytest.fixture()
+def sqlite_app():
+    """
+    Fixture for creating a Flask application backed by an in-memory SQLite database.
+
+    The tables are created before the test and the application context
+    stays pushed for the duration of the test.
+
+    Returns:
+        Flask: The Flask application bound to the SQLite database.
+    """
+
+    flask_app = Flask(__name__)
+    flask_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    flask_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(flask_app)
+
+    with flask_app.app_context():
+        db.create_all(bind_key=None)
+        yield flask_app
+        db.session.remove()
+        db.drop_all(bind_key=None)
@@ -0,0 +1,127 @@
+"""
+Admin cache and password check tests
+
+This module contains pytest test cases for the cached admin loader
+and the bounded password check pool.
+"""
+
+import pytest
+
+from sqlalchemy import event
+
+from models import db
+
+import admin as admin_module
+
+from admin import (Admin, PasswordCheckBusy, PasswordCheckPool, admin_cache, password_pool,
+                   load_admin)
+
+from factory import create_app
+
+
+def create_admin():
+    """
+    Helper function to add an admin to the database.
+
+    Returns:
+        int: The ID of the admin.
+    """
+
+    admin = Admin(username='admin')
+    admin.set_password('password')
+    db.session.add(admin)
+    db.session.commit()
+    return admin.id
+
+
+def count_statements(func):
+    """
+    Helper function to count the SQL statements executed by a function.
+
+    Args:
+        func (callable): The function to call.
+
+    Returns:
+        tuple: The result of the function and the number of executed statements.
+    """
+
+    statements = []
+
+    def before_cursor_execute(*_):
+        statements.append(1)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return result, len(statements)
+
+
+def test_load_admin_is_cached(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that a loaded admin is served from the cache.
+
+    The test asserts that the second load of the same admin in a new session
+    executes no query, and that changing the password drops the cache entry.
+    """
+
+    admin_id = create_admin()
+    admin_cache.invalidate(admin_id)
+
+    admin, first = count_statements(lambda: load_admin(str(admin_id)))
+    db.session.remove()
+    cached, second = count_statements(lambda: load_admin(str(admin_id)))
+
+    assert first == 1
+    assert second == 0
+    assert cached.username == admin.username == 'admin'
+    assert cached.get_id() == str(admin_id)
+
+    cached.set_password('new password')
+    db.session.commit()
+
+    admin, third = count_statements(lambda: load_admin(admin_id))
+    assert third == 1
+    assert admin.check_password('new password')
+
+
+def test_password_check_pool_is_bounded(monkeypatch):
+    """
+    Test case to verify that password checks beyond the pool bound are rejected.
+
+    The test takes every slot of a pool with a single worker and no queue
+    and asserts that a further check fails right away.
+    """
+
+    pool = PasswordCheckPool(workers=1, queue=0)
+    monkeypatch.setattr(admin_module, 'password_pool', pool)
+    hashed = admin_module.hash_password('password')
+
+    assert admin_module.verify_password_bounded('password', hashed)
+
+    # pylint: disable=protected-access
+    pool._slots.acquire()
+    try:
+        with pytest.raises(PasswordCheckBusy):
+            admin_module.verify_password_bounded('password', hashed)
+    finally:
+        pool._slots.release()
+
+
+def test_admin_settings_come_from_the_app_config():
+    """
+    Test case to verify that the admin cache and the password check pool follow the app config.
+
+    The test builds an application with overridden settings and asserts
+    that registering the admin blueprint applies them.
+    """
+
+    create_app({'SECRET_KEY': 'test', 'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+                'ADMIN_CACHE_TTL': 5.0, 'BCRYPT_WORKERS': 3, 'BCRYPT_QUEUE': 4})
+
+    assert admin_cache.ttl == 5.0
+    assert (password_pool.workers, password_pool.queue) == (3, 4)
+
+    create_app({'SECRET_KEY': 'test', 'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    assert admin_cache.ttl == 60.0
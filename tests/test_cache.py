@@ -0,0 +1,89 @@
+"""
+Response cache tests
+
+This module contains pytest test cases for the in-process response cache
+used in front of the read endpoints.
+"""
+
+from flask import jsonify
+
+from models import db
+
+from cache import ResponseCache
+
+from versioning import bump_data_version
+
+
+def test_least_recently_used_entry_is_evicted():
+    """
+    Test case to verify the LRU eviction of a full cache.
+
+    The test fills a cache of two entries, touches the first one, adds a third one
+    and asserts that the untouched entry was evicted and counted.
+    """
+
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.set('a', 1, 'A')
+    cache.set('b', 1, 'B')
+    cache.get('a', 1)
+    cache.set('c', 1, 'C')
+
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 1) == 'A'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_expired_and_outdated_entries_are_misses():
+    """
+    Test case to verify that expired entries and entries of an older data version are not served.
+
+    The test asserts that both lookups are counted as misses.
+    """
+
+    cache = ResponseCache(max_entries=2, ttl=0)
+    cache.set('a', 1, 'A')
+    assert cache.get('a', 1) is None
+
+    cache = ResponseCache(max_entries=2, ttl=60)
+    cache.set('a', 1, 'A')
+    assert cache.get('a', 2) is None
+
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['invalidations'] == 1
+    assert stats['size'] == 0
+
+
+def test_cached_view_is_invalidated_by_writes(sqlite_app):
+    """
+    Test case to verify that a cached view is served from the cache until the data version changes.
+
+    The test asserts that repeated requests with the same query arguments call the view once,
+    and that a committed write makes the next request call the view again.
+    """
+
+    cache = ResponseCache(max_entries=8, ttl=60)
+    calls = []
+
+    @cache.cached
+    def probe():
+        calls.append(1)
+        return jsonify(books=[len(calls)])
+
+    sqlite_app.add_url_rule('/probe', view_func=probe)
+
+    with sqlite_app.test_client() as client:
+        first = client.get('/probe?limit=5')
+        second = client.get('/probe?limit=5')
+
+        assert first.get_data() == second.get_data()
+        assert len(calls) == 1
+
+        client.get('/probe?limit=6')
+        assert len(calls) == 2
+
+        bump_data_version()
+        db.session.commit()
+
+        assert client.get('/probe?limit=5').json == {'books': [3]}
+        assert cache.stats()['hits'] == 1
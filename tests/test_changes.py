@@ -0,0 +1,64 @@
+"""
+Change feed tests
+
+This module contains pytest test cases for the change log written by the write paths
+and the change feed read from it.
+"""
+
+from models import db
+
+from changes import changes_since
+
+from importer import import_records
+
+from versioning import current_data_version
+
+from writes import add_note
+
+
+def test_writes_are_logged_in_order(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that the admin write path logs its rows and bumps the data version.
+
+    The test adds two notes and asserts that the feed since the first write only
+    returns the rows inserted by the second one, together with the token to continue from:
+    the reused author and book are not sent again.
+    """
+
+    add_note('Сенека', 'Стоїк', 'Листи', 'Лист 1', 'Перша нотатка')
+    db.session.commit()
+    _, first_token, _ = changes_since()
+
+    add_note('Сенека', 'Стоїк', 'Листи', 'Лист 2', 'Друга нотатка')
+    db.session.commit()
+
+    changed, token, has_more = changes_since(first_token)
+    assert changed['notes'] == [{'id': 2, 'book_id': 1, 'chapter_id': 2,
+                                 'content': 'Друга нотатка',
+                                 'created_date': changed['notes'][0]['created_date']}]
+    assert changed['chapters'] == [{'id': 2, 'book_id': 1, 'name': 'Лист 2'}]
+    assert changed['authors'] == changed['books'] == []
+    assert token > first_token and not has_more
+    assert current_data_version()[0] == 2
+
+    assert changes_since(token) == ({'authors': [], 'books': [], 'chapters': [], 'notes': []},
+                                    token, False)
+
+
+def test_change_feed_is_paginated(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify reading the change feed page by page after a bulk import.
+
+    The test follows the tokens until no change is left and asserts that
+    every imported note is returned exactly once.
+    """
+
+    import_records([{'author': 'Сенека', 'book': 'Листи', 'chapter': f'Лист {number}',
+                     'content': f'Нотатка {number}'} for number in range(5)])
+
+    notes, token, has_more = [], None, True
+    while has_more:
+        changed, token, has_more = changes_since(token, limit=3)
+        notes.extend(note['id'] for note in changed['notes'])
+
+    assert notes == [1, 2, 3, 4, 5]
@@ -0,0 +1,81 @@
+"""
+Response compression tests
+
+This module contains pytest test cases for the negotiated compression
+of JSON responses and the reuse of compressed bodies from the response cache.
+"""
+
+import gzip
+
+from flask import jsonify
+
+import compression
+
+from cache import ResponseCache
+
+from compression import init_compression
+
+
+def test_large_json_responses_are_compressed(sqlite_app):
+    """
+    Test case to verify the negotiation and the size threshold.
+
+    The test asserts that a large response is gzip-compressed for a client accepting gzip,
+    sent as is without 'Accept-Encoding', that a small response is never compressed,
+    and that the compressed response carries a weak entity tag.
+    """
+
+    sqlite_app.config['COMPRESS_MIN_SIZE'] = 100
+    init_compression(sqlite_app)
+
+    @sqlite_app.route('/large')
+    def large():
+        response = jsonify(notes=['Пізнай самого себе'] * 20)
+        response.set_etag('v1')
+        return response
+
+    sqlite_app.add_url_rule('/small', view_func=lambda: jsonify(notes=[]))
+    client = sqlite_app.test_client()
+
+    plain = client.get('/large')
+    assert 'Content-Encoding' not in plain.headers
+
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip;q=1.0, identity;q=0.5'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.get_etag() == ('v1', True)
+    assert gzip.decompress(response.get_data()) == plain.get_data()
+
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+
+
+def test_cached_responses_are_compressed_once(sqlite_app, monkeypatch):
+    """
+    Test case to verify that a cached payload is compressed only once per encoding.
+
+    The test counts the gzip compressions of two requests served by a cached view
+    and asserts that the second request reused the compressed body of the cache entry.
+    """
+
+    sqlite_app.config['COMPRESS_MIN_SIZE'] = 0
+    init_compression(sqlite_app)
+
+    compressions = []
+
+    def counting_gzip(data):
+        compressions.append(data)
+        return gzip.compress(data)
+
+    monkeypatch.setitem(compression.COMPRESSORS, 'gzip', counting_gzip)
+    monkeypatch.setattr(compression, 'PREFERENCE', ('gzip',))
+
+    cache = ResponseCache(max_entries=8, ttl=60)
+    sqlite_app.add_url_rule('/cached', view_func=cache.cached(lambda: jsonify(books=[1])))
+    client = sqlite_app.test_client()
+
+    first = client.get('/cached', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/cached', headers={'Accept-Encoding': 'gzip'})
+
+    assert first.get_data() == second.get_data()
+    assert gzip.decompress(second.get_data()) == b'{"books":[1]}\n'
+    assert len(compressions) == 1
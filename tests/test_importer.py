@@ -0,0 +1,115 @@
+"""
+Bulk import tests
+
+This module contains pytest test cases for the 'flask import-notes' command.
+
+The tests import JSON Lines and CSV files into an in-memory SQLite database.
+"""
+
+import json
+
+from sqlalchemy import event
+
+from models import db, Author, Book, Chapter, Note
+
+from importer import import_notes_command, import_records
+
+from versioning import current_data_version
+
+
+def write_jsonl(path, records):
+    """
+    Helper function to write records to a JSON Lines file.
+
+    Args:
+        path (Path): The path of the file.
+        records (list): The records to write.
+    """
+
+    path.write_text('\n'.join(json.dumps(record, ensure_ascii=False) for record in records),
+                    encoding='utf-8')
+
+
+def test_import_notes_command(sqlite_app, tmp_path):
+    """
+    Test case to verify importing JSON Lines and CSV files with the CLI command.
+
+    The test asserts that authors and books are shared between records,
+    that the report is printed and that importing the same files again skips every record.
+    """
+
+    jsonl = tmp_path / 'notes.jsonl'
+    write_jsonl(jsonl, [
+        {'author': 'Сенека', 'bio': 'Стоїк', 'book': 'Листи', 'chapter': 'Лист 1',
+         'content': 'Перша нотатка', 'created_date': '2023-06-01'},
+        {'author': 'Сенека', 'book': 'Листи', 'chapter': 'Лист 2', 'content': 'Друга нотатка'},
+    ])
+    csv_file = tmp_path / 'notes.csv'
+    csv_file.write_text('author,bio,book,chapter,content\n'
+                        'Марк Аврелій,Імператор,Наодинці з собою,Книга 1,Третя нотатка\n',
+                        encoding='utf-8')
+
+    sqlite_app.cli.add_command(import_notes_command)
+    runner = sqlite_app.test_cli_runner()
+
+    result = runner.invoke(args=['import-notes', str(jsonl), str(csv_file)])
+
+    assert result.exit_code == 0, result.output
+    assert 'Imported 3 notes, 3 chapters, 2 books and 2 authors' in result.output
+    assert db.session.query(Author).count() == 2
+    assert db.session.query(Book).count() == 2
+    assert db.session.get(Note, 1).created_date.isoformat() == '2023-06-01'
+    assert current_data_version()[0] == 1
+
+    result = runner.invoke(args=['import-notes', str(jsonl), str(csv_file)])
+
+    assert result.exit_code == 0, result.output
+    assert 'Imported 0 notes' in result.output
+    assert 'skipped 3 duplicates' in result.output
+    assert db.session.query(Note).count() == 3
+
+
+def test_import_rejects_incomplete_records(sqlite_app, tmp_path):
+    """
+    Test case to verify that a record without content fails the import.
+
+    The test asserts that the command exits with an error and the batch is rolled back.
+    """
+
+    jsonl = tmp_path / 'notes.jsonl'
+    write_jsonl(jsonl, [{'author': 'Сенека', 'book': 'Листи', 'chapter': 'Лист 1'}])
+
+    sqlite_app.cli.add_command(import_notes_command)
+    result = sqlite_app.test_cli_runner().invoke(args=['import-notes', str(jsonl)])
+
+    assert result.exit_code != 0
+    assert 'missing content' in result.output
+    assert db.session.query(Author).count() == 0
+
+
+def test_import_query_count_depends_on_batches(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that the number of queries depends on the number of batches,
+    not on the number of records.
+
+    The test imports 500 records in a single batch and asserts that only a handful
+    of statements were executed.
+    """
+
+    records = [{'author': f'Автор {number % 5}', 'book': f'Книга {number % 20}',
+                'chapter': f'Розділ {number}', 'content': f'Нотатка {number}'}
+               for number in range(500)]
+    statements = []
+
+    def before_cursor_execute(*_):
+        statements.append(1)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        stats = import_records(records, batch_size=1000)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert stats.notes == 500
+    assert db.session.query(Chapter).count() == 500
+    assert len(statements) < 20
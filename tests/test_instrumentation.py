@@ -0,0 +1,104 @@
+"""
+SQL instrumentation tests
+
+This module contains pytest test cases for the per-request SQL query counting and timing.
+"""
+
+import json
+
+import logging
+
+import time
+
+from flask import jsonify
+
+from sqlalchemy.exc import DatabaseError
+
+from models import db, Author
+
+from instrumentation import init_sql_timing
+
+
+def register_probe(flask_app):
+    """
+    Helper function to register a view executing two queries.
+
+    Args:
+        flask_app (Flask): The application to register the view on.
+    """
+
+    @flask_app.route('/probe')
+    def probe():
+        db.session.query(Author).count()
+        db.session.query(Author).all()
+        return jsonify(ok=True)
+
+
+def test_server_timing_header(sqlite_app, caplog):
+    """
+    Test case to verify the 'Server-Timing' header and the log line when SQL_TIMING is enabled.
+
+    The test asserts that both report the two queries of the view.
+    """
+
+    sqlite_app.config['SQL_TIMING'] = True
+    init_sql_timing(sqlite_app)
+    register_probe(sqlite_app)
+
+    with caplog.at_level(logging.INFO, logger='instrumentation'):
+        with sqlite_app.test_client() as client:
+            response = client.get('/probe?x=1')
+
+    timings = response.headers.getlist('Server-Timing')
+    assert timings[0].startswith('db;desc="2 queries";dur=')
+    assert timings[1].startswith('total;dur=')
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['path'] == '/probe?x=1'
+    assert record['queries'] == 2
+
+
+def test_failed_statements_are_timed(sqlite_app):
+    """
+    Test case to verify that a failing statement does not disturb the timing of the next ones.
+
+    The test runs a view whose first statement fails and asserts that the failed
+    and the following statement are both counted, with a plausible duration.
+    """
+
+    sqlite_app.config['SQL_TIMING'] = True
+    init_sql_timing(sqlite_app)
+
+    @sqlite_app.route('/failing')
+    def failing():
+        try:
+            db.session.execute(db.text('SELECT * FROM missing_table'))
+        except DatabaseError:
+            db.session.rollback()
+        db.session.query(Author).count()
+        return jsonify(ok=True)
+
+    with sqlite_app.test_client() as client:
+        client.get('/failing')
+        time.sleep(0.05)
+        response = client.get('/failing')
+
+    db_timing = response.headers.getlist('Server-Timing')[0]
+    assert db_timing.startswith('db;desc="2 queries";dur=')
+    assert float(db_timing.split('dur=')[1]) < 50
+
+
+def test_no_server_timing_when_disabled(sqlite_app):
+    """
+    Test case to verify that nothing is measured when SQL_TIMING is disabled.
+
+    The test asserts that the response has no 'Server-Timing' header.
+    """
+
+    init_sql_timing(sqlite_app)
+    register_probe(sqlite_app)
+
+    with sqlite_app.test_client() as client:
+        response = client.get('/probe')
+
+    assert 'Server-Timing' not in response.headers
@@ -0,0 +1,57 @@
+"""
+JSON provider tests
+
+This module contains pytest test cases for the orjson-based JSON provider
+and its standard library fallback.
+"""
+
+from datetime import date
+
+from decimal import Decimal
+
+import pytest
+
+from json_provider import FastJSONProvider, orjson
+
+PAYLOAD = {
+    'Пізнай самого себе': [
+        {'id': 1, 'content': 'Гнів — це коротке божевілля', 'chapter': 'Розділ 1'},
+        {'id': 2, 'content': 'Quote "with" \\ escapes\n', 'chapter': None},
+    ],
+    'meta': {'created': date(2024, 1, 2), 'price': Decimal('1.50'), 'ok': True, 'ratio': 0.5},
+}
+
+
+@pytest.mark.skipif(orjson is None, reason='orjson is not installed')
+def test_orjson_output_matches_the_fallback(sqlite_app):
+    """
+    Test case to verify that orjson and the standard library produce the same bytes.
+
+    The test serializes a payload with Cyrillic text, escapes, a date and a decimal
+    through both paths, compact and indented, and through 'jsonify'-style responses.
+    """
+
+    fast = FastJSONProvider(sqlite_app)
+    fallback = FastJSONProvider(sqlite_app)
+    fallback.use_orjson = False
+
+    assert fast.dumps(PAYLOAD) == fallback.dumps(PAYLOAD)
+    assert fast.dumps(PAYLOAD, indent=2) == fallback.dumps(PAYLOAD, indent=2)
+    assert fast.response(PAYLOAD).get_data() == fallback.response(PAYLOAD).get_data()
+    assert fast.loads(fast.dumps([1, 'два'])) == [1, 'два']
+
+
+def test_non_ascii_text_is_written_as_utf8(sqlite_app):
+    """
+    Test case to verify the output format of the provider.
+
+    The test asserts that Cyrillic text is not escaped, that keys are sorted,
+    that the output is compact and that dates keep Flask's HTTP date format.
+    """
+
+    provider = FastJSONProvider(sqlite_app)
+    body = provider.response(PAYLOAD).get_data().decode()
+
+    assert body.startswith('{"meta":{"created":"Tue, 02 Jan 2024 00:00:00 GMT"')
+    assert '"Пізнай самого себе":[{"chapter":"Розділ 1"' in body
+    assert body.endswith('}\n')
@@ -0,0 +1,75 @@
+"""
+Metrics tests
+
+This module contains pytest test cases for the Prometheus metrics of the application.
+"""
+
+import os
+
+import subprocess
+
+import sys
+
+from flask import Flask, jsonify
+
+from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+from metrics import init_metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER_SCRIPT = '''
+from flask import Flask, jsonify
+from metrics import init_metrics
+
+app = Flask(__name__)
+init_metrics(app)
+app.add_url_rule('/probe', 'probe', lambda: jsonify(ok=True))
+client = app.test_client()
+for _ in range(3):
+    client.get('/probe')
+'''
+
+
+def test_metrics_endpoint():
+    """
+    Test case to verify the metrics of a request in the Prometheus text format.
+
+    The test asserts that the latency histogram, the size histogram and the status counter
+    of the requested endpoint are exposed and that no request is left in flight.
+    """
+
+    app = Flask(__name__)
+    init_metrics(app)
+    app.add_url_rule('/metrics_probe', 'metrics_probe', lambda: jsonify(ok=True))
+
+    with app.test_client() as client:
+        client.get('/metrics_probe')
+        client.get('/missing')
+        body = client.get('/metrics').get_data(as_text=True)
+
+    assert 'http_request_duration_seconds_count{endpoint="metrics_probe",method="GET"} 1.0' in body
+    assert 'http_response_size_bytes_count{endpoint="metrics_probe",method="GET"} 1.0' in body
+    assert ('http_requests_total{endpoint="metrics_probe",method="GET",status="200"} 1.0'
+            in body)
+    assert 'http_requests_total{endpoint="unmatched",method="GET",status="404"} 1.0' in body
+    assert 'http_requests_in_flight{endpoint="metrics_probe"} 0.0' in body
+
+
+def test_metrics_are_aggregated_across_processes(tmp_path):
+    """
+    Test case to verify the multiprocess mode used with several gunicorn workers.
+
+    The test runs two worker processes sharing a metrics directory and asserts
+    that the aggregated counter holds the requests of both.
+    """
+
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path), PYTHONPATH=ROOT)
+    for _ in range(2):
+        subprocess.run([sys.executable, '-c', WORKER_SCRIPT], env=env, check=True, cwd=ROOT)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=str(tmp_path))
+    body = generate_latest(registry).decode()
+
+    assert 'http_requests_total{endpoint="probe",method="GET",status="200"} 6.0' in body
@@ -0,0 +1,349 @@
+"""
+Read layer tests
+
+This module contains pytest test cases for the read layer used by the API endpoints.
+
+The tests run against an in-memory SQLite database and check both the
+shape of the payloads and the number of queries issued to build them.
+"""
+
+from datetime import date
+
+import pytest
+
+from sqlalchemy import event
+
+from models import db, Author, Book, Chapter, Note, lookup_key
+
+from queries import (find_books, find_authors, all_books, books_for_authors, all_authors,
+                     notes_for_books, all_notes, iter_notes, catalog)
+
+from read_model import rebuild_note_summaries
+
+from writes import add_note
+
+from pagination import PaginationError, encode_cursor, decode_cursor
+
+
+def seed_notes(count):
+    """
+    Helper function to fill the database and the read model with a book
+    and the given number of notes.
+
+    Args:
+        count (int): The number of notes to create.
+
+    Returns:
+        Book: The book the notes belong to.
+    """
+
+    author = Author(name='Сенека', biography='Римський філософ-стоїк')
+    book = Book(title='Листи до Луцилія', author=author)
+    for number in range(count):
+        chapter = Chapter(book=book, chapter_name=f'Лист {number}')
+        db.session.add(Note(book=book, chapter=chapter, content=f'Нотатка {number}',
+                            created_date=date.today()))
+    db.session.commit()
+    rebuild_note_summaries()
+    db.session.commit()
+    return book
+
+
+def count_queries(func, *args):
+    """
+    Helper function to count the SQL statements executed by a function.
+
+    Args:
+        func (callable): The function to call.
+        *args: Positional arguments passed to the function.
+
+    Returns:
+        int: The number of executed statements.
+    """
+
+    statements = []
+
+    def before_cursor_execute(*_):
+        statements.append(1)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        func(*args)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return len(statements)
+
+
+def test_all_notes_payload(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify the payload of all notes.
+
+    The test asserts that every note carries its book title and chapter name.
+    """
+
+    seed_notes(2)
+
+    assert all_notes() == ([
+        {'id': 1, 'book': 'Листи до Луцилія', 'content': 'Нотатка 0', 'chapter': 'Лист 0'},
+        {'id': 2, 'book': 'Листи до Луцилія', 'content': 'Нотатка 1', 'chapter': 'Лист 1'},
+    ], None)
+
+
+def test_notes_for_book_payload(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify the payload of the notes of a single book.
+
+    The test asserts that every note carries its chapter name.
+    """
+
+    book = seed_notes(2)
+
+    assert notes_for_books([book]) == ({'Листи до Луцилія': [
+        {'id': 1, 'content': 'Нотатка 0', 'chapter': 'Лист 0'},
+        {'id': 2, 'content': 'Нотатка 1', 'chapter': 'Лист 1'},
+    ]}, None)
+
+
+def test_query_count_does_not_grow_with_notes(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that the number of queries does not depend on the number of notes.
+
+    The test counts the queries for a few notes and for many notes
+    and asserts that both counts are equal.
+    """
+
+    book = seed_notes(3)
+    few_all = count_queries(all_notes)
+    few_by_book = count_queries(notes_for_books, [book])
+
+    for number in range(3, 200):
+        chapter = Chapter(book=book, chapter_name=f'Лист {number}')
+        db.session.add(Note(book=book, chapter=chapter, content=f'Нотатка {number}',
+                            created_date=date.today()))
+    db.session.commit()
+    rebuild_note_summaries()
+    db.session.commit()
+    db.session.expire_all()
+
+    assert count_queries(all_notes) == few_all == 1
+    assert count_queries(notes_for_books, [book]) == few_by_book
+
+
+def test_keyset_pages_cover_all_rows(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify walking through the notes page by page.
+
+    The test follows the returned IDs until the last page and asserts that
+    every note is returned exactly once and in order.
+    """
+
+    book = seed_notes(7)
+
+    seen = []
+    after = None
+    while True:
+        notes, after = all_notes(after=after, limit=3)
+        seen.extend(note['id'] for note in notes)
+        if after is None:
+            break
+
+    assert seen == list(range(1, 8))
+    assert notes_for_books([book], after=6, limit=3) == (
+        {'Листи до Луцилія': [{'id': 7, 'content': 'Нотатка 6', 'chapter': 'Лист 6'}]}, None)
+    assert all_books(limit=1) == ([{'id': 1, 'title': 'Листи до Луцилія'}], None)
+    assert all_authors(after=1, limit=1) == ([], None)
+
+
+def test_iter_notes_streams_in_batches(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify streaming notes from a server-side cursor.
+
+    The test streams the notes in small batches and asserts that the result
+    matches the unpaginated notes and respects the starting cursor.
+    """
+
+    book = seed_notes(5)
+
+    assert list(iter_notes(batch_size=2)) == all_notes()[0]
+    assert [note['id'] for note in iter_notes([book], after=3, batch_size=2)] == [4, 5]
+
+
+def test_batch_lookups_group_by_key(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify looking up several books and authors at once.
+
+    The test requests repeated and comma-separated keys, including an unknown one,
+    and asserts that the keys are resolved and their rows grouped with one query each.
+    """
+
+    seed_notes(2)
+    second = Author(name='Марк Аврелій', biography='Імператор')
+    book = Book(title='Наодинці з собою', author=second)
+    db.session.add(Note(book=book, chapter=Chapter(book=book, chapter_name='Книга I'),
+                        content='Роби, що мусиш', created_date=date.today()))
+    db.session.add(Book(title='Про гнів, милосердя', author=second))
+    db.session.commit()
+    rebuild_note_summaries()
+    db.session.commit()
+
+    assert count_queries(find_books, ['Наодинці з собою,Листи до Луцилія', 'Невідома']) == 1
+    books, missing = find_books(['Наодинці з собою,Листи до Луцилія', 'Невідома'])
+    assert [found.title for found in books] == ['Наодинці з собою', 'Листи до Луцилія']
+    assert missing == ['Невідома']
+    assert [found.title for found in find_books(['Про гнів, милосердя'])[0]] == [
+        'Про гнів, милосердя']
+
+    assert count_queries(notes_for_books, books) == 1
+    notes, _ = notes_for_books(books, fields=['chapter'])
+    assert notes == {'Листи до Луцилія': [{'id': 1, 'chapter': 'Лист 0'},
+                                          {'id': 2, 'chapter': 'Лист 1'}],
+                     'Наодинці з собою': [{'id': 3, 'chapter': 'Книга I'}]}
+
+    authors, _ = find_authors(['Сенека', 'Марк Аврелій'])
+    assert books_for_authors(authors) == ({
+        'Сенека': [{'id': 1, 'title': 'Листи до Луцилія'}],
+        'Марк Аврелій': [{'id': 2, 'title': 'Наодинці з собою'},
+                         {'id': 3, 'title': 'Про гнів, милосердя'}],
+    }, None)
+
+    # A book without notes is still listed
+    assert all_books(fields=['title'])[0][-1] == {'id': 3, 'title': 'Про гнів, милосердя'}
+
+
+def test_lookups_ignore_case_and_normalization(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify looking up books and authors by their normalized keys.
+
+    The test requests names in other cases, with extra whitespace and in a compatibility
+    form, and asserts that they are found with a single query and returned once.
+    """
+
+    seed_notes(1)
+    db.session.add(Author(name='ＭＡＲＣＵＳ  Aurelius', biography='Emperor'))
+    db.session.commit()
+
+    assert lookup_key(' Листи  ДО\tлуцилія ') == 'листи до луцилія'
+    assert db.session.execute(db.select(Author.name_key).order_by(Author.id)).scalars().all() == [
+        'сенека', 'marcus aurelius']
+
+    assert count_queries(find_books, ['листи до луцилія']) == 1
+    books, missing = find_books(['ЛИСТИ  ДО ЛУЦИЛІЯ', 'листи до луцилія', 'Невідома'])
+    assert [found.title for found in books] == ['Листи до Луцилія']
+    assert missing == ['Невідома']
+
+    authors, missing = find_authors(['сенека,Marcus aurelius'])
+    assert [found.name for found in authors] == ['Сенека', 'ＭＡＲＣＵＳ  Aurelius']
+    assert not missing
+
+
+def test_catalog_tree_uses_a_fixed_number_of_queries(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify the nested catalog.
+
+    The test asserts the shape of the tree and that the number of queries
+    stays at one per level when the tree grows.
+    """
+
+    book = seed_notes(2)
+    db.session.expunge_all()
+
+    tree, next_id = catalog()
+    assert next_id is None
+    assert tree[0]['name'] == 'Сенека'
+    assert tree[0]['books'][0]['title'] == 'Листи до Луцилія'
+    assert tree[0]['books'][0]['chapters'][1] == {
+        'id': 2, 'name': 'Лист 1',
+        'notes': [{'id': 2, 'content': 'Нотатка 1', 'created_date': date.today().isoformat()}]}
+    db.session.expunge_all()
+    few = count_queries(catalog)
+
+    for number in range(10):
+        author = Author(name=f'Автор {number}', biography='')
+        book = Book(title=f'Книга {number}', author=author)
+        for chapter_number in range(5):
+            db.session.add(Note(book=book, content=f'{number} {chapter_number}',
+                                chapter=Chapter(book=book, chapter_name=str(chapter_number)),
+                                created_date=date.today()))
+    db.session.commit()
+    db.session.expunge_all()
+
+    assert count_queries(catalog) == few == 4
+    assert [author['id'] for author in catalog(after=1, limit=2)[0]] == [2, 3]
+
+
+def test_catalog_lists_every_note_of_a_chapter(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that the catalog keeps several notes of the same chapter.
+
+    The test adds two notes to one chapter and asserts that both are listed in ID order.
+    """
+
+    assert add_note('Сенека', 'Стоїк', 'Листи', 'Лист 1', 'Перша нотатка')
+    assert add_note('Сенека', 'Стоїк', 'Листи', 'Лист 1', 'Друга нотатка')
+    db.session.commit()
+    db.session.expunge_all()
+
+    chapters = catalog()[0][0]['books'][0]['chapters']
+    assert len(chapters) == 1
+    assert [note['content'] for note in chapters[0]['notes']] == ['Перша нотатка',
+                                                                  'Друга нотатка']
+
+
+def test_sparse_fieldsets_skip_unrequested_columns(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify the 'fields' selection of the read layer.
+
+    The test asserts that only the requested fields and the ID are returned,
+    that the large text columns are not part of the SQL statement,
+    and that the pagination still works without the ID being requested.
+    """
+
+    seed_notes(3)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *_):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        authors, _ = all_authors(fields=['name'])
+        notes, next_id = all_notes(limit=2, fields=['chapter'])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert authors == [{'id': 1, 'name': 'Сенека'}]
+    assert notes == [{'id': 1, 'chapter': 'Лист 0'}, {'id': 2, 'chapter': 'Лист 1'}]
+    assert next_id == 2
+    assert not any('biography' in statement or 'content' in statement
+                   for statement in statements)
+
+
+def test_large_text_columns_are_deferred(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that loading a model does not read its large text column.
+
+    The test asserts that the biography of a loaded author is only read when accessed.
+    """
+
+    seed_notes(1)
+    db.session.expunge_all()
+
+    author = db.session.execute(db.select(Author)).scalar_one()
+    assert 'biography' not in author.__dict__
+    assert author.biography == 'Римський філософ-стоїк'
+
+
+def test_cursor_round_trip():
+    """
+    Test case to verify encoding and decoding of pagination cursors.
+
+    The test asserts that a cursor decodes to the original ID
+    and that malformed cursors, including non-ASCII digits, are rejected.
+    """
+
+    assert decode_cursor(encode_cursor(42)) == 42
+
+    for cursor in ('not-a-cursor', 'aWQ6wrI', 'aWQ6'):
+        with pytest.raises(PaginationError):
+            decode_cursor(cursor)
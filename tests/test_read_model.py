@@ -0,0 +1,55 @@
+"""
+Read model tests
+
+This module contains pytest test cases for the denormalized note read model.
+"""
+
+from models import db, Note, NoteSummary
+
+from read_model import rebuild_note_summaries
+
+from writes import add_note
+
+from queries import all_books, all_notes
+
+
+def test_write_path_maintains_read_model(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that notes added through the write path appear in the read model.
+
+    The test asserts that the summary rows hold the book title, author and chapter name
+    and that the read layer returns them.
+    """
+
+    add_note('Сенека', 'Стоїк', 'Листи', 'Лист 1', 'Перша нотатка')
+    add_note('Сенека', 'Стоїк', 'Про гнів', 'Книга 1', 'Друга нотатка')
+    db.session.commit()
+
+    summary = db.session.get(NoteSummary, 1)
+    assert (summary.book_title, summary.author_name, summary.chapter_name) == (
+        'Листи', 'Сенека', 'Лист 1')
+
+    assert all_notes()[0] == [
+        {'id': 1, 'book': 'Листи', 'content': 'Перша нотатка', 'chapter': 'Лист 1'},
+        {'id': 2, 'book': 'Про гнів', 'content': 'Друга нотатка', 'chapter': 'Книга 1'},
+    ]
+    assert all_books()[0] == [{'id': 1, 'title': 'Листи'}, {'id': 2, 'title': 'Про гнів'}]
+
+
+def test_rebuild_read_model(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify rebuilding the read model from the catalog tables.
+
+    The test empties the read model and asserts that a rebuild restores every row.
+    """
+
+    add_note('Сенека', 'Стоїк', 'Листи', 'Лист 1', 'Перша нотатка')
+    add_note('Сенека', 'Стоїк', 'Листи', 'Лист 2', 'Друга нотатка')
+    db.session.commit()
+    db.session.execute(db.delete(NoteSummary))
+    db.session.commit()
+
+    rebuild_note_summaries()
+    db.session.commit()
+
+    assert db.session.query(NoteSummary).count() == db.session.query(Note).count() == 2
@@ -0,0 +1,75 @@
+"""
+Database configuration and read-replica tests
+
+This module contains pytest test cases for the database configuration
+and the routing of reads to the read replica.
+
+Two SQLite files stand in for the primary database and the replica.
+"""
+
+from flask import Flask, jsonify
+
+from models import db, Author
+
+from config import database_config
+
+from replica import PRIMARY_READS_KEY, read_replica
+
+
+def test_database_config_from_environment():
+    """
+    Test case to verify building the database configuration from environment variables.
+
+    The test asserts that the URI, the pool options and the replica bind are taken over.
+    """
+
+    config = database_config({'DATABASE_URL': 'sqlite:///primary.db',
+                              'DATABASE_REPLICA_URL': 'sqlite:///replica.db',
+                              'DB_POOL_SIZE': '20', 'DB_MAX_OVERFLOW': '5',
+                              'DB_POOL_PRE_PING': 'false'})
+
+    assert config['SQLALCHEMY_DATABASE_URI'] == 'sqlite:///primary.db'
+    assert config['SQLALCHEMY_BINDS'] == {'replica': 'sqlite:///replica.db'}
+    assert config['SQLALCHEMY_ENGINE_OPTIONS'] == {
+        'pool_pre_ping': False, 'pool_recycle': 1800, 'pool_size': 20, 'max_overflow': 5}
+
+
+def test_reads_of_marked_views_go_to_replica(tmp_path):
+    """
+    Test case to verify that marked views read from the replica and other views use the primary.
+
+    The test puts a different author into each database and asserts which one every view sees,
+    that a write made by an unmarked view lands in the primary and that a request
+    asking for primary reads sees it.
+    """
+
+    app = Flask(__name__)
+    app.config.update(database_config({
+        'DATABASE_URL': f'sqlite:///{tmp_path / "primary.db"}',
+        'DATABASE_REPLICA_URL': f'sqlite:///{tmp_path / "replica.db"}',
+    }))
+    db.init_app(app)
+
+    @app.route('/get/authors')
+    @read_replica
+    def replica_authors():
+        return jsonify([author.name for author in Author.query.all()])
+
+    @app.route('/admin/authors', methods=['GET', 'POST'])
+    def primary_authors():
+        db.session.add(Author(name='Марк Аврелій', biography='Імператор'))
+        db.session.commit()
+        return jsonify([author.name for author in Author.query.all()])
+
+    with app.app_context():
+        for engine, name in ((db.engines[None], 'Сенека'), (db.engines['replica'], 'Епіктет')):
+            db.metadata.create_all(engine)
+            with engine.begin() as connection:
+                connection.execute(db.insert(Author), {'name': name, 'biography': 'Стоїк'})
+
+    with app.test_client() as client:
+        assert client.get('/get/authors').json == ['Епіктет']
+        assert client.post('/admin/authors').json == ['Сенека', 'Марк Аврелій']
+        assert client.get('/get/authors').json == ['Епіктет']
+        assert client.get('/get/authors', environ_overrides={PRIMARY_READS_KEY: True}).json == [
+            'Сенека', 'Марк Аврелій']
@@ -0,0 +1,79 @@
+"""
+Search tests
+
+This module contains pytest test cases for the full-text search over notes.
+
+The tests run against the SQLite FTS5 fallback of the search.
+"""
+
+from datetime import date
+
+from models import db, Author, Book, Chapter, Note
+
+from search import search_notes
+
+
+def seed_search_notes():
+    """
+    Helper function to fill the database with notes to search in.
+    """
+
+    author = Author(name='Сенека', biography='Римський філософ-стоїк')
+    book = Book(title='Про гнів', author=author)
+    contents = ['Гнів є короткочасне божевілля, гнів руйнує',
+                'Мудрий не знає ГНІВУ і гнів йому чужий',
+                'Про дружбу і вірність',
+                'Quoted "AND" text']
+    for number, content in enumerate(contents):
+        chapter = Chapter(book=book, chapter_name=f'Книга {number + 1}')
+        db.session.add(Note(book=book, chapter=chapter, content=content,
+                            created_date=date.today()))
+    db.session.commit()
+
+
+def test_search_finds_cyrillic_notes(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify searching Cyrillic notes regardless of casing.
+
+    The test asserts that only matching notes are returned, best match first,
+    together with their book and chapter.
+    """
+
+    seed_search_notes()
+
+    notes, next_offset = search_notes('ГНІВ')
+
+    assert [note['id'] for note in notes] == [1, 2]
+    assert notes[0]['book'] == 'Про гнів'
+    assert notes[0]['chapter'] == 'Книга 1'
+    assert next_offset is None
+
+
+def test_search_is_paginated(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify paging through the search results.
+
+    The test asserts that the second page continues where the first one stopped.
+    """
+
+    seed_search_notes()
+
+    first, next_offset = search_notes('гнів', limit=1)
+    second, last_offset = search_notes('гнів', offset=next_offset, limit=1)
+
+    assert [note['id'] for note in first + second] == [1, 2]
+    assert last_offset is None
+
+
+def test_search_treats_operators_as_text(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that search operators in the query are matched literally.
+
+    The test asserts that a query with quotes and 'AND' does not fail.
+    """
+
+    seed_search_notes()
+
+    notes, _ = search_notes('"AND" quoted')
+
+    assert [note['id'] for note in notes] == [4]
@@ -0,0 +1,210 @@
+"""
+Snapshot tests
+
+This module contains pytest test cases for the pre-compressed snapshot files
+of the unfiltered catalog reads and for serving them without the database.
+"""
+
+import gzip
+
+import json
+
+import logging
+
+import os
+
+import threading
+
+from flask import jsonify
+
+from prometheus_client import REGISTRY
+
+from sqlalchemy import event
+
+from admin import Admin
+
+from factory import create_app
+
+from models import db
+
+from snapshot import REBUILD_THREAD_NAME, build_snapshot, init_snapshot
+
+
+def _add_view(app, calls):
+    """
+    Registers a view counting its calls on '/get/authors'.
+    """
+
+    @app.route('/get/authors')
+    def get_author():
+        calls.append(1)
+        response = jsonify([{'id': 1, 'name': 'Сенека'}])
+        response.set_etag('v3')
+        return response
+
+
+def _admin_app(tmp_path, snapshot_dir):
+    """
+    Builds an application with SNAPSHOT_ON_WRITE and SQL_TIMING enabled, a SQLite file
+    database and an admin, and returns a test client logged in as that admin.
+    """
+
+    app = create_app({'SECRET_KEY': 'test', 'WTF_CSRF_ENABLED': False,
+                      'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "catalog.db"}',
+                      'SNAPSHOT_ON_WRITE': True, 'SNAPSHOT_DIR': snapshot_dir,
+                      'SQL_TIMING': True})
+    with app.app_context():
+        db.create_all(bind_key=None)
+        admin = Admin(username='admin')
+        admin.set_password('password')
+        db.session.add(admin)
+        db.session.commit()
+        admin_id = admin.id
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(admin_id)
+        session['_fresh'] = True
+    return app, client
+
+
+def _post_note(app, client, content):
+    """
+    Posts a note through the admin interface and waits for the snapshot rebuild it starts.
+
+    Returns:
+        tuple: The response and the number of statements executed by the admin request itself.
+    """
+
+    request_thread = threading.get_ident()
+    statements = []
+
+    def before_cursor_execute(*_):
+        if threading.get_ident() == request_thread:
+            statements.append(1)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.post('/admin/interface', data={
+            'author': 'Сенека', 'bio': 'Стоїк', 'book': 'Листи', 'chapter': 'Лист 1',
+            'content': content})
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    for thread in threading.enumerate():
+        if thread.name == REBUILD_THREAD_NAME:
+            thread.join(timeout=10)
+    return response, len(statements)
+
+
+def test_snapshot_is_rebuilt_after_an_admin_write(tmp_path):
+    """
+    Test case to verify the SNAPSHOT_ON_WRITE rebuild after a submission in the admin interface.
+
+    The test posts a note and asserts that the rebuilt snapshot holds it, that the admin
+    request is no longer counted as in flight and that its 'Server-Timing' header
+    reports the queries of the admin request, not of the rendered snapshot requests.
+    """
+
+    snapshot_dir = tmp_path / 'snapshot'
+    app, client = _admin_app(tmp_path, str(snapshot_dir))
+
+    response, statements = _post_note(app, client, 'Нотатка після запису')
+    assert response.status_code == 302
+
+    manifest = json.loads((snapshot_dir / 'manifest.json').read_text(encoding='utf-8'))
+    notes = (snapshot_dir / manifest['entries']['/get/notes?']['file']).read_text(encoding='utf-8')
+    assert 'Нотатка після запису' in notes
+
+    for endpoint in ('admin.admin_interface', 'api.get_notes'):
+        assert REGISTRY.get_sample_value('http_requests_in_flight',
+                                         {'endpoint': endpoint}) == 0
+    assert response.headers.getlist('Server-Timing')[0].startswith(
+        f'db;desc="{statements} queries"')
+
+
+def test_failed_rebuild_does_not_fail_the_write(tmp_path, caplog):
+    """
+    Test case to verify that a snapshot rebuild failing after an admin write is only logged.
+
+    The test points SNAPSHOT_DIR at a file, posts a note and asserts that the submission
+    succeeds and that the failure is logged.
+    """
+
+    snapshot_file = tmp_path / 'not-a-directory'
+    snapshot_file.write_bytes(b'')
+    app, client = _admin_app(tmp_path, str(snapshot_file))
+
+    with caplog.at_level(logging.ERROR, logger='snapshot'):
+        response, _ = _post_note(app, client, 'Нотатка')
+
+    assert response.status_code == 302
+    assert 'db_error=False' in response.headers['Location']
+    assert 'Rebuilding the snapshot' in caplog.text
+
+
+def test_snapshot_files_are_named_by_content(sqlite_app, tmp_path):
+    """
+    Test case to verify the files written by build_snapshot.
+
+    The test asserts that the plain and gzip files carry the digest of the response
+    in their names, that the gzip file holds the rendered response and that
+    files of an older build are removed while other files are kept.
+    """
+
+    _add_view(sqlite_app, [])
+    (tmp_path / 'authors.0000000000000000.json').write_bytes(b'[]')
+    (tmp_path / 'authors.0000000000000000.json.gz').write_bytes(b'')
+    (tmp_path / 'settings.json').write_bytes(b'{}')
+
+    manifest = build_snapshot(sqlite_app, str(tmp_path), urls=('/get/authors',))
+    entry = manifest['entries']['/get/authors?']
+
+    assert entry['etag'] == 'v3'
+    assert 'gzip' in entry['encodings']
+    body = (tmp_path / entry['file']).read_bytes()
+    assert gzip.decompress((tmp_path / (entry['file'] + '.gz')).read_bytes()) == body
+    assert body.startswith(b'[{"id":1')
+    assert not os.path.exists(tmp_path / 'authors.0000000000000000.json')
+    assert not os.path.exists(tmp_path / 'authors.0000000000000000.json.gz')
+    assert os.path.exists(tmp_path / 'settings.json')
+
+
+def test_snapshot_is_served_without_the_view(sqlite_app, tmp_path):
+    """
+    Test case to verify the serving mode.
+
+    The test builds a snapshot, enables serving and asserts that the snapshot request
+    is answered with the gzip file and a weak form of its entity tag without calling
+    the view, while a filtered request still reaches the view.
+    """
+
+    calls = []
+    _add_view(sqlite_app, calls)
+    sqlite_app.config.update(SNAPSHOT_SERVE=True, SNAPSHOT_DIR=str(tmp_path))
+    init_snapshot(sqlite_app)
+
+    build_snapshot(sqlite_app, str(tmp_path), urls=('/get/authors',))
+    calls.clear()
+    client = sqlite_app.test_client()
+
+    response = client.get('/get/authors', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.get_etag() == ('v3', True)
+    assert gzip.decompress(response.get_data()).decode().startswith('[{"id":1')
+
+    response = client.get('/get/authors', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_etag() == ('v3', False)
+
+    response = client.get('/get/authors', headers={'Accept-Encoding': 'gzip',
+                                                    'If-None-Match': 'W/"v3"'})
+    assert response.status_code == 304
+    response = client.get('/get/authors', headers={'If-None-Match': '"v3"'})
+    assert response.status_code == 304
+    assert not calls
+
+    client.get('/get/authors?limit=1')
+    assert calls
@@ -0,0 +1,84 @@
+"""
+Startup time tests
+
+This module contains pytest test cases measuring the imports made while building
+the application, in the manner of 'python -X importtime'.
+
+Run with 'pytest -s' to see the report of the slowest imports.
+"""
+
+import os
+
+import subprocess
+
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ADMIN_STACK = ('flask_login', 'flask_wtf', 'wtforms', 'bcrypt', 'flask_migrate', 'alembic',
+               'admin', 'forms', 'admin_views')
+
+
+def import_times(config):
+    """
+    Helper function to build the application in a fresh interpreter and collect its import times.
+
+    Args:
+        config (str): The Python expression of the configuration passed to create_app.
+
+    Returns:
+        tuple: The cumulative import time in microseconds of every imported module,
+        and of the modules imported directly by the command.
+    """
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'from factory import create_app; create_app({config})'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, 'DATABASE_URL': 'sqlite://', 'PYTHONDONTWRITEBYTECODE': '1'},
+    )
+
+    times, top_level = {}, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        times[module.strip()] = int(cumulative)
+        # Nested imports are indented below the module importing them
+        if not module[1:].startswith(' '):
+            top_level[module.strip()] = int(cumulative)
+    return times, top_level
+
+
+def report(title, times, top_level):
+    """
+    Helper function to print the total and the slowest directly imported modules.
+
+    Args:
+        title (str): The title of the report.
+        times (dict): The import times of every module collected by import_times.
+        top_level (dict): The import times of the directly imported modules.
+    """
+
+    print(f'\n{title}: {len(times)} modules imported in {sum(top_level.values()) / 1000:.1f} ms')
+    for module, time in sorted(top_level.items(), key=lambda item: -item[1])[:10]:
+        print(f'{time / 1000:>10.1f} ms  {module}')
+
+
+def test_api_only_workers_skip_the_admin_stack():
+    """
+    Test case to verify that an API-only application does not import the admin stack.
+
+    The test builds the full and the API-only application, prints their import reports
+    and asserts that only the full application imports the admin interface and its
+    dependencies.
+    """
+
+    full, full_top_level = import_times('')
+    api_only, api_only_top_level = import_times("{'API_ONLY': True}")
+    report('full application', full, full_top_level)
+    report('API-only application', api_only, api_only_top_level)
+
+    assert all(module in full for module in ADMIN_STACK)
+    assert not [module for module in ADMIN_STACK if module in api_only]
+    assert len(api_only) < len(full)
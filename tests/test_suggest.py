@@ -0,0 +1,129 @@
+"""
+Autocomplete tests
+
+This module contains pytest test cases for the in-memory prefix index
+of author names and book titles.
+"""
+
+import math
+
+from models import db, Author, Book
+
+from suggest import SuggestIndex, fold
+
+
+def seed_authors():
+    """
+    Helper function to add authors and books with Cyrillic and accented names.
+    """
+
+    seneca = Author(name='Луцій Анней Сенека', biography='')
+    db.session.add_all([
+        Book(title='Листи до Луцилія', author=seneca),
+        Book(title='Про гнів', author=seneca),
+        Book(title='Énchiridion', author=Author(name='Épictète', biography='')),
+        Author(name='Сковорода', biography=''),
+    ])
+    db.session.commit()
+
+
+def test_fold_ignores_case_and_diacritics():
+    """
+    Test case to verify the folding of names for matching.
+
+    The test asserts that case, Latin diacritics and extra whitespace are ignored.
+    """
+
+    assert fold('  Épictète ') == 'epictete'
+    assert fold('СЕНЕКА') == 'сенека'
+    assert fold('Ї') == fold('і')
+
+
+def test_lookup_matches_word_prefixes(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify prefix lookups of authors and books.
+
+    The test asserts that any word of a name can be matched by a case- and
+    diacritic-insensitive prefix and that the limit is respected.
+    """
+
+    seed_authors()
+    index = SuggestIndex()
+
+    assert index.lookup('author', 'сен', 10, version=1) == [(1, 'Луцій Анней Сенека')]
+    assert index.lookup('author', 'С', 10, version=1) == [(1, 'Луцій Анней Сенека'),
+                                                           (3, 'Сковорода')]
+    assert index.lookup('author', 'epic', 10, version=1) == [(2, 'Épictète')]
+    assert index.lookup('book', 'ЛИСТИ', 10, version=1) == [(1, 'Листи до Луцилія')]
+    assert index.lookup('book', 'енч', 10, version=1) == []
+    assert len(index.lookup('author', 'с', 1, version=1)) == 1
+
+
+def test_index_is_rebuilt_for_a_new_version(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that the index follows the data version.
+
+    The test adds an author after the first lookup and asserts that it is only
+    found once a newer data version is passed.
+    """
+
+    seed_authors()
+    index = SuggestIndex()
+    assert index.lookup('author', 'плат', 10, version=1) == []
+
+    db.session.add(Author(name='Платон', biography=''))
+    db.session.commit()
+
+    assert index.lookup('author', 'плат', 10, version=1) == []
+    assert index.lookup('author', 'плат', 10, version=2) == [(4, 'Платон')]
+
+
+class CountingList(list):
+    """
+    List counting how many of its items are read, by the binary search or the scan.
+    """
+
+    reads = 0
+
+    def __getitem__(self, position):
+        self.reads += 1
+        return super().__getitem__(position)
+
+
+def count_key_reads(size):
+    """
+    Helper function to count the index keys read by a lookup in an index of the given size.
+
+    Args:
+        size (int): The number of authors to index.
+
+    Returns:
+        int: The number of keys read by the lookup.
+    """
+
+    db.session.execute(db.delete(Author))
+    db.session.execute(db.insert(Author), [{'name': f'Автор {number}', 'biography': ''}
+                                           for number in range(size)])
+    db.session.commit()
+
+    index = SuggestIndex()
+    index.refresh(version=size)
+    # pylint: disable=protected-access
+    keys = index._keys['author'] = CountingList(index._keys['author'])
+    assert len(index.lookup('author', 'автор 7', 10, version=size)) == 10
+    return keys.reads
+
+
+def test_lookup_cost_grows_logarithmically(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that the cost of a lookup barely depends on the size of the index.
+
+    The test counts the keys read by the same lookup in an index of 100 and of 20,000
+    authors, and asserts that the larger index only adds the steps of the binary search:
+    about log2(200) more, where a linear scan would read 200 times as many keys.
+    """
+
+    small = count_key_reads(100)
+    large = count_key_reads(20000)
+
+    assert large - small <= math.ceil(math.log2(20000 / 100)) + 1
@@ -0,0 +1,81 @@
+"""
+Data version tests
+
+This module contains pytest test cases for the data version counter
+and the conditional GET support of the read endpoints.
+"""
+
+from flask import jsonify
+
+from models import db
+
+from versioning import current_data_version, bump_data_version, conditional
+
+
+def register_probe(flask_app, calls):
+    """
+    Helper function to register a conditional view that records its calls.
+
+    Args:
+        flask_app (Flask): The application to register the view on.
+        calls (list): The list every call of the view is appended to.
+    """
+
+    @conditional
+    def probe():
+        calls.append(1)
+        return jsonify(books=[])
+
+    flask_app.add_url_rule('/probe', view_func=probe)
+
+
+def test_bump_data_version(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that committed writes increment the data version.
+
+    The test asserts that the version starts at zero and grows with every bump.
+    """
+
+    assert current_data_version() == (0, None)
+
+    bump_data_version()
+    db.session.commit()
+    bump_data_version()
+    db.session.commit()
+
+    version, updated_at = current_data_version()
+    assert version == 2
+    assert updated_at is not None
+
+
+def test_conditional_get_returns_not_modified(sqlite_app):
+    """
+    Test case to verify answering a matching 'If-None-Match' with 304.
+
+    The test asserts that the view is not called for a matching entity tag
+    and is called again once the data version changes.
+    """
+
+    calls = []
+    register_probe(sqlite_app, calls)
+    bump_data_version()
+    db.session.commit()
+
+    with sqlite_app.test_client() as client:
+        response = client.get('/probe')
+        etag = response.headers['ETag']
+
+        assert response.status_code == 200
+        assert response.headers['Last-Modified']
+
+        response = client.get('/probe', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert len(calls) == 1
+
+        bump_data_version()
+        db.session.commit()
+
+        response = client.get('/probe', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert len(calls) == 2
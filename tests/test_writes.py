@@ -0,0 +1,75 @@
+"""
+Write path tests
+
+This module contains pytest test cases for the single-transaction write path
+of the admin interface.
+"""
+
+from datetime import date
+
+from models import db, Author, Book, Chapter, Note, content_hash
+
+from writes import add_note
+
+from versioning import current_data_version
+
+
+def test_add_note_reuses_existing_rows(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that notes of the same author, book and chapter share their rows.
+
+    The test adds two notes to the same chapter and a note to another book of the author,
+    and asserts that the author, book and chapter rows were reused.
+    """
+
+    assert add_note('Сенека', 'Стоїк', 'Листи', 'Лист 1', 'Перша нотатка')
+    db.session.commit()
+    assert add_note('Сенека', 'Інша біографія', 'Листи', 'Лист 1', 'Друга нотатка')
+    assert add_note('Сенека', 'Стоїк', 'Про гнів', 'Книга 1', 'Третя нотатка')
+    db.session.commit()
+
+    assert db.session.query(Author).count() == 1
+    assert db.session.query(Author).one().biography == 'Стоїк'
+    assert db.session.query(Book).count() == 2
+    assert db.session.query(Chapter).count() == 2
+    assert db.session.query(Note).count() == 3
+    assert current_data_version()[0] == 3
+
+    chapter = db.session.execute(db.select(Chapter).filter_by(chapter_name='Лист 1')).scalar_one()
+    assert sorted(note.content for note in chapter.note) == ['Друга нотатка', 'Перша нотатка']
+
+
+def test_add_note_detects_duplicates(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that the same note is not added twice.
+
+    The test asserts that the second submission is reported as a duplicate
+    and leaves the data version unchanged.
+    """
+
+    assert add_note('Сенека', 'Стоїк', 'Листи', 'Лист 1', 'Нотатка')
+    db.session.commit()
+
+    assert not add_note('Сенека', 'Стоїк', 'Листи', 'Лист 1', 'Нотатка')
+    db.session.rollback()
+
+    assert db.session.query(Note).count() == 1
+    assert current_data_version()[0] == 1
+
+
+def test_content_hash_is_filled_in(sqlite_app):  # pylint: disable=unused-argument
+    """
+    Test case to verify that notes added through the ORM get their content digest.
+
+    The test asserts that the stored digest is the SHA-256 digest of the content.
+    """
+
+    author = Author(name='Сенека', biography='Стоїк')
+    book = Book(title='Листи', author=author)
+    note = Note(book=book, chapter=Chapter(book=book, chapter_name='Лист 1'),
+                content='Нотатка', created_date=date.today())
+    db.session.add(note)
+    db.session.commit()
+
+    assert note.content_hash == content_hash('Нотатка')
+    assert len(note.content_hash) == 64
@@ -0,0 +1,138 @@
+"""
+Data version and conditional GET support
+
+The catalog only changes when the admin interface commits a new entry.
+Every such commit bumps a single version counter stored in the DataVersion table.
+
+The read endpoints use the counter as their validator: they send it as the 'ETag'
+header together with the time of the last write as 'Last-Modified', and answer
+matching 'If-None-Match' or 'If-Modified-Since' requests with 304 Not Modified
+without querying the catalog tables.
+
+Functions:
+- current_data_version - Reads the version counter and the time of the last write
+- request_data_version - Reads the version counter once per request
+- bump_data_version - Increments the version counter in the current transaction
+- conditional - Decorator adding conditional GET support to a view
+"""
+
+from datetime import datetime, timezone
+
+from functools import wraps
+
+from flask import request, make_response
+
+from models import db, DataVersion
+
+VERSION_ROW_ID = 1
+
+DATA_VERSION_KEY = 'philosophy_api.data_version'
+
+
+def current_data_version():
+    """
+    Reads the version counter of the catalog data.
+
+    Returns:
+        tuple: The version number and the time of the last write,
+        or (0, None) if nothing was written yet.
+    """
+
+    row = db.session.execute(
+        db.select(DataVersion.version, DataVersion.updated_at)
+        .where(DataVersion.id == VERSION_ROW_ID)
+    ).first()
+
+    if row is None:
+        return 0, None
+
+    updated_at = row.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return row.version, updated_at
+
+
+def request_data_version():
+    """
+    Reads the version counter of the catalog data once per request.
+
+    Returns:
+        tuple: The version number and the time of the last write.
+    """
+
+    if DATA_VERSION_KEY not in request.environ:
+        request.environ[DATA_VERSION_KEY] = current_data_version()
+    return request.environ[DATA_VERSION_KEY]
+
+
+def bump_data_version():
+    """
+    Increments the version counter of the catalog data.
+
+    The change is made in the current session, so it is committed
+    together with the catalog write that caused it. The version row is seeded by
+    the migrations, so concurrent writers queue on its row lock; the row is only
+    added here for databases created without them, such as the test databases.
+    """
+
+    now = datetime.now(timezone.utc)
+    result = db.session.execute(
+        db.update(DataVersion)
+        .where(DataVersion.id == VERSION_ROW_ID)
+        .values(version=DataVersion.version + 1, updated_at=now)
+    )
+
+    if result.rowcount == 0:
+        db.session.add(DataVersion(id=VERSION_ROW_ID, version=1, updated_at=now))
+
+
+def _not_modified(etag, last_modified):
+    """
+    Checks whether the client already has the current version of the data.
+
+    Args:
+        etag (str): The current entity tag.
+        last_modified (datetime): The time of the last write, or None.
+
+    Returns:
+        bool: True if the request validators match the current version.
+    """
+
+    if request.if_none_match:
+        # Weak comparison, compressed responses carry a weak tag
+        return request.if_none_match.contains_weak(etag)
+
+    if request.if_modified_since and last_modified:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def conditional(view):
+    """
+    Decorator adding conditional GET support driven by the data version to a view.
+
+    Args:
+        view (callable): The view function to wrap.
+
+    Returns:
+        callable: The wrapped view function.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version, last_modified = request_data_version()
+        etag = f'v{version}'
+
+        if _not_modified(etag, last_modified):
+            response = make_response('', 304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        return response
+
+    return wrapper
@@ -0,0 +1,107 @@
+"""
+Write path of the admin interface
+
+A submitted note is written in a single transaction: the author, the book and the chapter
+are inserted with INSERT ... ON CONFLICT DO NOTHING on their unique keys, which returns the
+ID of a new row; an existing row is then read by its key instead. The note is inserted
+unless the chapter already holds a note with the same content digest. Concurrent
+submissions can therefore never create duplicate authors, books, chapters or notes,
+and no row is looked up before it is written.
+The summary row of the new note is written to the read model, and the note and the rows
+that were really inserted are logged for the change feed, in the same transaction.
+Reused authors, books and chapters are not logged, as they did not change.
+
+PostgreSQL and SQLite both support INSERT ... ON CONFLICT ... RETURNING.
+
+Functions:
+- add_note - Writes a note together with its author, book and chapter
+"""
+
+from datetime import date
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import db, Author, Book, Chapter, Note, content_hash
+
+from read_model import add_note_summaries
+
+from changes import record_changes
+
+DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def _upsert(model, values, keys):
+    """
+    Inserts a row or reuses the existing row with the same unique key.
+
+    Args:
+        model (db.Model): The model to write.
+        values (dict): The column values of the new row.
+        keys (list): The names of the columns of the unique key.
+
+    Returns:
+        tuple: The ID of the new or the existing row, and whether the row was inserted.
+    """
+
+    insert = DIALECT_INSERTS[db.session.get_bind(mapper=model).dialect.name]
+    row_id = db.session.execute(
+        insert(model).values(**values).on_conflict_do_nothing(index_elements=keys)
+        .returning(model.id)
+    ).scalar()
+    if row_id is not None:
+        return row_id, True
+
+    # The conflicting row is committed or was written by this transaction, so it is visible
+    return db.session.execute(
+        db.select(model.id).filter_by(**{key: values[key] for key in keys})
+    ).scalar_one(), False
+
+
+def add_note(author, biography, book, chapter, content, created_date=None):
+    """
+    Writes a note together with its author, book and chapter in the current transaction.
+
+    Existing authors, books and chapters are reused by name, title and chapter name;
+    the biography of an existing author is left as it is. A chapter can hold several notes,
+    as long as their contents differ.
+    The caller commits or rolls back the transaction.
+
+    Args:
+        author (str): The name of the author.
+        biography (str): The biography of the author.
+        book (str): The title of the book.
+        chapter (str): The name of the chapter.
+        content (str): The content of the note.
+        created_date (date): The creation date of the note, today by default.
+
+    Returns:
+        bool: True if the note was added, False if the chapter already holds the same content.
+    """
+
+    author_id, new_author = _upsert(Author, {'name': author, 'biography': biography},
+                                    ['name'])
+    book_id, new_book = _upsert(Book, {'title': book, 'author_id': author_id}, ['title'])
+    chapter_id, new_chapter = _upsert(Chapter, {'book_id': book_id, 'chapter_name': chapter},
+                                      ['book_id', 'chapter_name'])
+
+    insert = DIALECT_INSERTS[db.session.get_bind(mapper=Note).dialect.name]
+    note = db.session.execute(
+        insert(Note).values(book_id=book_id, chapter_id=chapter_id, content=content,
+                            content_hash=content_hash(content),
+                            created_date=created_date or date.today())
+        .on_conflict_do_nothing(index_elements=['book_id', 'chapter_id', 'content_hash'])
+        .returning(Note.id)
+    ).first()
+
+    if note is None:
+        return False
+
+    add_note_summaries([note.id])
+    record_changes({'author': [author_id] if new_author else [],
+                    'book': [book_id] if new_book else [],
+                    'chapter': [chapter_id] if new_chapter else [],
+                    'note': [note.id]})
+    return True